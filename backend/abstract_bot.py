@@ -1,10 +1,45 @@
 from durak_actions import Input_actions, Output_actions
+from game_log import DEBUG, INFO
+from legal_moves import (
+    legal_attacks,
+    legal_defences,
+    legal_forwards,
+    forwarding_allowance,
+)
 from abc import ABC, abstractmethod
-from typing import Any, List, Tuple, Dict, Optional
+from typing import Any, List, Tuple, Dict, Optional, Sequence
 from time import time
+from collections import deque
+import copy
+
+
+# The type bytes of the fields of a compacted event (see compact_event)
+_INT = 0
+_CARD = 1
+_CARD_LIST = 2
+_CARD_TUPLE = 3
+_INT_LIST = 4
+
+
+def _is_card(value: Any) -> bool:
+    return (
+        isinstance(value, tuple)
+        and len(value) == 2
+        and all(isinstance(i, int) for i in value)
+        and 0 <= value[1] < 4
+    )
 
 
 class AbstractBot(ABC):
+    # The event history kept for get_raw_events(). Bots that need it opt in by
+    # overriding these in their class:
+    #   EVENT_HISTORY_SIZE: 0 keeps no history, None keeps every event, and
+    #       n > 0 keeps only the last n events.
+    #   COMPACT_EVENT_HISTORY: store each event as a few bytes holding all
+    #       of its fields (see compact_event) instead of the event tuple.
+    EVENT_HISTORY_SIZE: Optional[int] = 0
+    COMPACT_EVENT_HISTORY: bool = False
+
     def notify_optional_attack(
         self, attacker_index: int, card_list: List[Tuple[int, int]]
     ):
@@ -95,10 +130,14 @@ class AbstractBot(ABC):
 
     def get_table_attack(self) -> List[Optional[Tuple[int, int]]]:
         """Get the current attacking cards on the table."""
+        if type(self.__table_attack) is not list:
+            self.__table_attack = list(self.__table_attack)
         return self.__table_attack
 
     def get_table_defence(self) -> List[Optional[Tuple[int, int]]]:
         """Get the current defending cards on the table."""
+        if type(self.__table_defence) is not list:
+            self.__table_defence = list(self.__table_defence)
         return self.__table_defence
 
     def get_current_attacker(self) -> int:
@@ -115,18 +154,141 @@ class AbstractBot(ABC):
 
     def get_num_cards_per_hand(self) -> List[int]:
         """Get the amount of cards in each hand."""
+        if type(self.__cards_per_hand) is not list:
+            self.__cards_per_hand = list(self.__cards_per_hand)
         return self.__cards_per_hand
 
     def get_deck_count(self) -> int:
         """Get the number of cards left in the deck."""
         return self.__deck_count
 
+    def get_legal_attacks(self) -> List[Tuple[int, int]]:
+        """Get the cards of the hand that may start or join the attack."""
+        return legal_attacks(self.__hand, self.__table_attack, self.__table_defence)
+
+    def get_legal_defences(self) -> List[Tuple[Tuple[int, int], int]]:
+        """Get (card, index) for every card of the hand that beats the
+        undefended attacking card at that index of the table."""
+        return legal_defences(
+            self.__hand,
+            self.__table_attack,
+            self.__table_defence,
+            self.__kozar_card[1],
+        )
+
+    def get_legal_forwards(self) -> List[Tuple[int, int]]:
+        """Get the cards of the hand that may forward the attack (none if it
+        cannot be forwarded)."""
+        allowance = forwarding_allowance(
+            self.__cards_per_hand,
+            self.__table_attack,
+            self.__defender,
+            self.__deck_count,
+        )
+        return legal_forwards(
+            self.__hand, self.__table_attack, self.__table_defence, allowance
+        )
+
     def get_raw_events(self) -> List[Tuple]:
-        """Get all the raw events that the bot has received, by order."""
-        return self.__events
+        """Get the raw events that the bot has received, by order (see
+        EVENT_HISTORY_SIZE). With COMPACT_EVENT_HISTORY, the events are
+        decoded back to the same tuples."""
+        if not hasattr(self, "_AbstractBot__events"):
+            return []
+        if self.COMPACT_EVENT_HISTORY:
+            return [
+                self.expand_event(event) if isinstance(event, bytes) else event
+                for event in self.__events
+            ]
+        return list(self.__events)
+
+    @staticmethod
+    def compact_event(event: Tuple) -> Any:
+        """Encode an event as bytes: the action, and then every field as a
+        type byte and its value. Integers (like player indexes, -1 included)
+        are stored + 1, cards as a code (rank * 4 + suit), and lists (or
+        tuples) of cards or integers as their length and items. An event
+        with a field of any other kind is returned as it is."""
+        encoded = [event[0].value]
+        for field in event[1:]:
+            if isinstance(field, int):
+                encoded += [_INT, field + 1]
+            elif isinstance(field, tuple) and _is_card(field):
+                encoded += [_CARD, field[0] * 4 + field[1]]
+            elif isinstance(field, (list, tuple)) and all(map(_is_card, field)):
+                kind = _CARD_LIST if isinstance(field, list) else _CARD_TUPLE
+                encoded += [kind, len(field)]
+                encoded += [rank * 4 + suit for rank, suit in field]
+            elif isinstance(field, list) and all(isinstance(i, int) for i in field):
+                encoded += [_INT_LIST, len(field)] + [i + 1 for i in field]
+            else:
+                return event
+        try:
+            return bytes(encoded)
+        except ValueError:  # An integer out of the range of a byte
+            return event
+
+    @staticmethod
+    def expand_event(encoded: bytes) -> Tuple:
+        """Decode an event encoded by compact_event."""
+        event = [Input_actions(encoded[0])]
+        i = 1
+        while i < len(encoded):
+            kind, value = encoded[i], encoded[i + 1]
+            i += 2
+            if kind == _INT:
+                event.append(value - 1)
+            elif kind == _CARD:
+                event.append((value // 4, value % 4))
+            else:
+                items = encoded[i : i + value]
+                i += value
+                if kind == _INT_LIST:
+                    event.append([item - 1 for item in items])
+                else:
+                    cards = [(code // 4, code % 4) for code in items]
+                    event.append(cards if kind == _CARD_LIST else tuple(cards))
+        return tuple(event)
+
+    def snapshot_state(self) -> Dict[str, Any]:
+        """A copy of the bot's state, for suspending or serializing a game.
+        Passing it back as the state of call() restores it. The state must be
+        plain data (it is sent to the UI as JSON): bots that keep other
+        objects on themselves override this and restore_state to convert
+        them."""
+        self.__own_params()
+        return copy.deepcopy(self.__dict__)
+
+    def __own_params(self) -> None:
+        """Replace the shared tuples of the last call by lists of the bot's
+        own, so its state is the same whether or not a getter was used."""
+        if hasattr(self, "_AbstractBot__table_attack"):
+            self.get_table_attack()
+            self.get_table_defence()
+            self.get_num_cards_per_hand()
+
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        """Restore a state given by snapshot_state (or returned by call())."""
+        self.__dict__.update(state)
+
+    def set_log_level(self, level: Optional[int]):
+        """Keep only log() messages of this level or higher (one of the levels
+        of game_log: DEBUG, INFO, WARNING or ERROR). None turns logging off,
+        for games where nobody reads the log."""
+        self.__log_level = level
+
+    def logging_enabled(self, level: int = INFO) -> bool:
+        """Whether log() keeps messages of a level. Bots can skip building
+        costly log messages when it does not."""
+        log_level = getattr(self, "_AbstractBot__log_level", DEBUG)
+        return log_level is not None and level >= log_level
 
-    def log(self, message: str):
-        if isinstance(message, str):
+    def log(self, message: str, *args, level: int = INFO):
+        """Log a message. With args, the message is a str.format template,
+        which is only formatted if the message is kept."""
+        if isinstance(message, str) and self.logging_enabled(level):
+            if args:
+                message = message.format(*args)
             ts = time()
             self.__logs.append(f"[TS:{ts}]Bot {self.__my_index}: {message}")
 
@@ -138,18 +300,31 @@ class AbstractBot(ABC):
         self,
         event: Tuple,
         hand: List,
-        table_attack: List,
-        table_defence: List,
-        cards_per_hand: List[int],
+        table_attack: Sequence,
+        table_defence: Sequence,
+        cards_per_hand: Sequence[int],
         curr_defender: int,
         deck_count: int,
-        state: Dict[str, Any],
+        state: Optional[Dict[str, Any]],
     ):
-        self.__dict__.update(state if state is not None else {})
+        # A bot instance that lives for the whole game keeps its state on
+        # itself: the engine passes None, and no state is merged or returned.
+        # Otherwise the state is restored from (and returned to) the engine.
+        if state is not None:
+            self.restore_state(state)
         if not hasattr(self, "_AbstractBot__events"):
-            self.__events = []
-        self.__events.append(event)
+            self.__events = (
+                []
+                if self.EVENT_HISTORY_SIZE is None
+                else deque(maxlen=self.EVENT_HISTORY_SIZE)
+            )
+        if self.EVENT_HISTORY_SIZE != 0:
+            self.__events.append(
+                self.compact_event(event) if self.COMPACT_EVENT_HISTORY else event
+            )
         action = event[0]
+        # The table and the hand sizes are tuples shared with the other bots:
+        # the getters copy them into lists of the bot's own when it asks
         self.__hand = hand
         self.__table_attack = table_attack
         self.__table_defence = table_defence
@@ -206,6 +381,8 @@ class AbstractBot(ABC):
                 self.notify_winner(event[1])
             case _:
                 raise ValueError(f"Unknown action: {action}")
-        ret_dict["state"] = self.__dict__
+        if state is not None:
+            self.__own_params()
+            ret_dict["state"] = self.__dict__
         ret_dict["log"] = self.__logs
         return ret_dict
@@ -0,0 +1,53 @@
+from typing import Any, Dict, List, Optional
+
+
+class BotClock:
+    """Time accounting of the bot calls of a single game.
+
+    Every call is recorded by bot and by action type (the Input_actions name
+    of its event) as [calls, cpu_seconds, wall_seconds, max_wall_seconds].
+    CPU time is the thread time of the call (or the worker's CPU time, for
+    sandboxed bots), so it is measured correctly in any thread or process.
+
+    If time_bank is given, every bot has that many (wall-clock) seconds for
+    the whole game, like a chess clock: each call is charged to it, and a bot
+    that ran out of time gets no more calls (see time_left)."""
+
+    def __init__(self, num_of_bots: int, time_bank: Optional[float] = None):
+        self.time_bank = time_bank
+        self.remaining: List[Optional[float]] = [time_bank] * num_of_bots
+        self.stats: List[Dict[str, List[float]]] = [{} for _ in range(num_of_bots)]
+
+    def time_left(self, bot_index: int) -> Optional[float]:
+        """Seconds left in a bot's time bank, or None if there is no bank."""
+        return self.remaining[bot_index]
+
+    def record(self, bot_index: int, action: Any, cpu: float, wall: float) -> None:
+        name = getattr(action, "name", str(action))
+        stats = self.stats[bot_index].setdefault(name, [0, 0.0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += cpu
+        stats[2] += wall
+        stats[3] = max(stats[3], wall)
+        if self.remaining[bot_index] is not None:
+            self.remaining[bot_index] = max(0.0, self.remaining[bot_index] - wall)
+
+    def summary(self) -> List[Dict[str, List[float]]]:
+        """The stats of every bot, by action type."""
+        return [
+            {name: list(stats) for name, stats in bot_stats.items()}
+            for bot_stats in self.stats
+        ]
+
+
+def merge_timing(
+    total: Dict[str, List[float]], timing: Dict[str, List[float]]
+) -> Dict[str, List[float]]:
+    """Add the stats of one bot in one game (a summary() entry) to a total."""
+    for name, (calls, cpu, wall, max_wall) in timing.items():
+        stats = total.setdefault(name, [0, 0.0, 0.0, 0.0])
+        stats[0] += calls
+        stats[1] += cpu
+        stats[2] += wall
+        stats[3] = max(stats[3], max_wall)
+    return total
@@ -0,0 +1,72 @@
+# Loading of bot files (.py or .pyc) into bot instances.
+# Kept separate from main.py so that tournament worker processes can load
+# bots without importing the web app.
+
+import copy
+import os
+import sys
+import importlib.util, importlib.machinery
+import traceback
+
+
+def load_bot(filepath):
+    # Ensure backend dir is in sys.path for bot imports
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    if backend_dir not in sys.path:
+        sys.path.insert(0, backend_dir)
+    if not os.path.exists(filepath):
+        raise FileNotFoundError(f"Bot file not found: {filepath}")
+    module_name = os.path.splitext(os.path.basename(filepath))[0]
+    if filepath.endswith(".py"):
+        spec = importlib.util.spec_from_file_location(module_name, filepath)
+    elif filepath.endswith(".pyc"):
+        loader = importlib.machinery.SourcelessFileLoader(module_name, filepath)
+        spec = importlib.util.spec_from_loader(module_name, loader)
+    else:
+        raise ImportError(f"Unsupported file type for bot file: {filepath}")
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Could not load spec for bot file: {filepath}")
+    try:
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+        # Try to get 'bot' instance, else fallback to module
+        bot_instance = getattr(module, "bot", module)
+        return bot_instance
+    except Exception as e:
+        print(f"[ERROR] Failed to load bot from {filepath}: {e}")
+        traceback.print_exc()
+        return None
+
+
+# Loaded bots by file path, with the st_mtime_ns of the file they were loaded
+# from. The cached bots are only used as templates: games play with copies
+# made by fresh_bot_instance, so the cached ones never hold game state.
+_bot_cache = {}
+
+
+def load_bot_cached(filepath):
+    """Like load_bot, but the bot file is only executed again if it changed
+    (by modification time) since it was last loaded."""
+    mtime = os.stat(filepath).st_mtime_ns
+    cached = _bot_cache.get(filepath)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    bot_instance = load_bot(filepath)
+    if bot_instance is not None:
+        _bot_cache[filepath] = (mtime, bot_instance)
+    return bot_instance
+
+
+def invalidate_bot(filepath):
+    """Drop a bot file from the cache (after it was replaced or deleted)."""
+    _bot_cache.pop(filepath, None)
+
+
+def fresh_bot_instance(bot):
+    """A copy of a loaded bot with no game state, so the same loaded bot can be
+    used for many games. Bots that are modules (no 'bot' instance) are shared."""
+    try:
+        return copy.deepcopy(bot)
+    except TypeError:
+        return bot
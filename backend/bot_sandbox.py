@@ -0,0 +1,324 @@
+# Sandboxed bots.
+# Every sandboxed bot runs in a long-lived worker process of its own, so an
+# uploaded bot cannot crash, block or look into the server process. The engine
+# plays with a SandboxedBot proxy, which forwards each call over a pipe.
+#
+# The server pickles its messages to the worker, with the action enums sent as
+# plain ints. The worker runs untrusted code, so its replies are JSON (which
+# cannot run code when loaded), and the server checks their shape before use;
+# the cards of an action arrive as lists and are turned back into tuples. The
+# bot keeps its game state inside its worker (the engine passes state=None to
+# bots with snapshot_state), so a call only carries the bot's view of the
+# table, and the reply only the action and the new log lines.
+# Workers are kept in a pool after their game ends and reused by later games
+# of the same bot file; every game gets a fresh copy of the loaded bot.
+# Workers are also limited in memory and CPU time per game (where the resource
+# module is available) and have deadlines for loading their bot file and for
+# every request. The worker process is the only isolation: a bot can still do
+# anything its process may do (open files, sockets, ...), so run the server
+# as a user that may do little.
+
+import json
+import multiprocessing
+import os
+import pickle
+import threading
+from collections import deque
+from time import process_time
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+from bot_loader import load_bot, fresh_bot_instance
+from configurations import (
+    SANDBOX_CPU_TIME_PER_GAME,
+    SANDBOX_MAX_IDLE_WORKERS,
+    SANDBOX_MAX_TIME_PER_CALL,
+    SANDBOX_MEMORY_LIMIT_MB,
+    SANDBOX_START_TIMEOUT,
+)
+from durak_actions import Input_actions, Output_actions
+
+# Message kinds
+_NEW_GAME = 0
+_CALL = 1
+_SNAPSHOT = 2
+_OK = 3
+_ERROR = 4
+
+_context = multiprocessing.get_context("spawn")
+
+
+def _dumps(message: Tuple) -> bytes:
+    return pickle.dumps(message, pickle.HIGHEST_PROTOCOL)
+
+
+def _plain(value: Any) -> Any:
+    """JSON form of the values of a bot's replies that json does not know."""
+    if isinstance(value, (set, frozenset, deque)):
+        return list(value)
+    if isinstance(value, bytes):
+        return list(value)
+    raise TypeError(f"{type(value).__name__} is not plain data")
+
+
+def _dumps_reply(reply: Tuple) -> bytes:
+    return json.dumps(reply, default=_plain).encode()
+
+
+def _action_from_json(action: Any) -> List:
+    """The action of a reply, with the enum restored and the cards (lists of
+    two items) turned back into tuples. The engine validates the rest."""
+    if not isinstance(action, list) or not action or type(action[0]) is not int:
+        raise ValueError(f"invalid action: {action!r}")
+    parts = [Output_actions(action[0])]
+    for part in action[1:]:
+        if isinstance(part, list):
+            part = [
+                tuple(item) if isinstance(item, list) and len(item) == 2 else item
+                for item in part
+            ]
+        parts.append(part)
+    return parts
+
+
+def _loads_reply(data: bytes, kind: int) -> Tuple[int, Any, float]:
+    """Decode and check a worker's reply to a request of a kind. Raises
+    ValueError for replies of the wrong shape."""
+    reply = json.loads(data)
+    if not (
+        isinstance(reply, list)
+        and len(reply) == 3
+        and reply[0] in (_OK, _ERROR)
+        and type(reply[2]) in (int, float)
+    ):
+        raise ValueError("malformed reply")
+    status, value, cpu_time = reply
+    if status == _ERROR:
+        if not isinstance(value, str):
+            raise ValueError("malformed error")
+    elif kind == _NEW_GAME:
+        value = None
+    elif kind == _SNAPSHOT:
+        if not isinstance(value, dict):
+            raise ValueError("the state is not a dict")
+    elif isinstance(value, dict):
+        result = {}
+        if "action" in value:
+            result["action"] = _action_from_json(value["action"])
+        if isinstance(value.get("log"), list):
+            result["log"] = [entry for entry in value["log"] if isinstance(entry, str)]
+        if "status" in value:
+            result["status"] = value["status"]
+        value = result
+    else:
+        raise ValueError("the result is not a dict")
+    return status, value, float(cpu_time)
+
+
+def _limit_cpu_time(seconds: float) -> None:
+    """Let the worker use at most seconds more CPU time: it is killed (by
+    SIGXCPU) once it used more."""
+    if resource is None:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft = int(usage.ru_utime + usage.ru_stime + seconds) + 1
+    hard = resource.getrlimit(resource.RLIMIT_CPU)[1]
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _worker_main(conn: Any, filepath: str) -> None:
+    if resource is not None:
+        limit = SANDBOX_MEMORY_LIMIT_MB * 2**20
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    # Loading the bot file runs its top-level code
+    _limit_cpu_time(SANDBOX_START_TIMEOUT)
+    template = load_bot(filepath)
+    name = getattr(template, "name", None)
+    conn.send_bytes(_dumps_reply((template is not None, str(name) if name else None)))
+    bot = None
+    while True:
+        try:
+            message = pickle.loads(conn.recv_bytes())
+        except EOFError:
+            return
+        start = process_time()
+        try:
+            if message[0] == _NEW_GAME:
+                _limit_cpu_time(SANDBOX_CPU_TIME_PER_GAME)
+                bot = fresh_bot_instance(template)
+                value = None
+            elif message[0] == _CALL:
+                event, *args = message[1]
+                value = bot.call((Input_actions(event[0]),) + tuple(event[1:]), *args)
+                action = value.get("action") if isinstance(value, dict) else None
+                if action and isinstance(action[0], Output_actions):
+                    value["action"] = [action[0].value] + list(action[1:])
+            else:
+                value = bot.snapshot_state() if hasattr(bot, "snapshot_state") else {}
+            reply = (_OK, value, process_time() - start)
+        except Exception as e:
+            reply = (_ERROR, f"{type(e).__name__}: {e}", process_time() - start)
+        try:
+            data = _dumps_reply(reply)
+        except Exception as e:
+            # The reply is not plain data
+            error = f"Bot returned an invalid value: {e}"
+            data = _dumps_reply((_ERROR, error, process_time() - start))
+        conn.send_bytes(data)
+
+
+class SandboxedBot:
+    """Proxy for a bot that runs in a worker process of its own.
+    call() has the signature of AbstractBot.call, plus the limits of the call:
+    timeout (wall-clock seconds) and cpu_budget (CPU seconds of the worker).
+    A call that runs out of wall-clock time kills the worker, and a worker
+    may die of its limits: is_alive() is then False, and the bot raises on
+    every call until the next new_game().
+    last_cpu_time is the CPU time the worker spent on the last request."""
+
+    sandboxed = True
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self.mtime = os.stat(filepath).st_mtime_ns
+        self.name = None
+        self.last_cpu_time = 0.0
+        self.__process = None
+        self.__conn = None
+        self.__start()
+
+    def __start(self) -> None:
+        parent_conn, child_conn = _context.Pipe()
+        self.__process = _context.Process(
+            target=_worker_main, args=(child_conn, self.filepath), daemon=True
+        )
+        self.__process.start()
+        child_conn.close()
+        self.__conn = parent_conn
+        try:
+            loaded = self.__conn.poll(SANDBOX_START_TIMEOUT)
+            if loaded:
+                loaded, self.name = json.loads(self.__conn.recv_bytes())
+        except (EOFError, OSError, ValueError, TypeError):
+            loaded = False
+        if not loaded or not isinstance(self.name, (str, type(None))):
+            self.close()
+            raise ImportError(f"Could not load bot file: {self.filepath}")
+
+    def is_alive(self) -> bool:
+        return self.__conn is not None
+
+    def __request(
+        self,
+        message: Tuple,
+        timeout: Optional[float] = None,
+        cpu_budget: Optional[float] = None,
+    ) -> Any:
+        self.last_cpu_time = 0.0
+        if self.__conn is None:
+            raise RuntimeError("The bot's worker was stopped")
+        try:
+            self.__conn.send_bytes(_dumps(message))
+            answered = self.__conn.poll(timeout)
+            if answered:
+                data = self.__conn.recv_bytes()
+        except (EOFError, OSError):
+            self.close()
+            raise RuntimeError("The bot's worker died")
+        if not answered:
+            self.close()
+            raise TimeoutError(f"Bot did not answer within {timeout} seconds")
+        try:
+            kind, value, cpu_time = _loads_reply(data, message[0])
+        except ValueError as e:
+            raise RuntimeError(f"Bot sent an invalid reply: {e}")
+        self.last_cpu_time = cpu_time
+        if kind == _ERROR:
+            raise RuntimeError(value)
+        if cpu_budget is not None and cpu_time > cpu_budget:
+            raise TimeoutError(
+                f"Bot used {cpu_time:.4f} CPU seconds (budget {cpu_budget})"
+            )
+        return value
+
+    def new_game(self) -> None:
+        """Start a new game with a fresh copy of the bot, restarting the worker
+        if it was stopped."""
+        if self.__conn is None:
+            self.__start()
+        self.__request((_NEW_GAME,), SANDBOX_MAX_TIME_PER_CALL)
+
+    def call(
+        self,
+        event: Tuple,
+        *args,
+        timeout: Optional[float] = None,
+        cpu_budget: Optional[float] = None,
+    ) -> Any:
+        event = (event[0].value,) + tuple(event[1:])
+        return self.__request((_CALL, (event, *args)), timeout, cpu_budget)
+
+    def snapshot_state(self) -> Dict[str, Any]:
+        if self.__conn is None:
+            # The state was lost with the worker
+            return {}
+        return self.__request((_SNAPSHOT,), SANDBOX_MAX_TIME_PER_CALL)
+
+    def close(self) -> None:
+        if self.__conn is not None:
+            self.__conn.close()
+            self.__conn = None
+        if self.__process is not None:
+            self.__process.kill()
+            self.__process.join()
+            self.__process = None
+
+
+# Idle workers by bot file path
+_idle_bots: Dict[str, List[SandboxedBot]] = {}
+_idle_bots_lock = threading.Lock()
+
+
+def acquire_sandboxed_bot(filepath: str) -> SandboxedBot:
+    """A sandboxed bot ready for a new game, reusing an idle worker of the same
+    bot file if there is one (and the file did not change since)."""
+    mtime = os.stat(filepath).st_mtime_ns
+    while True:
+        with _idle_bots_lock:
+            idle = _idle_bots.get(filepath)
+            bot = idle.pop() if idle else None
+        if bot is None:
+            bot = SandboxedBot(filepath)
+            break
+        if bot.mtime == mtime and bot.is_alive():
+            break
+        bot.close()
+    bot.new_game()
+    return bot
+
+
+def release_sandboxed_bot(bot: SandboxedBot) -> None:
+    """Return a bot whose game ended to the pool, for later games (or stop
+    its worker, if SANDBOX_MAX_IDLE_WORKERS of its file are idle)."""
+    if not bot.is_alive():
+        return
+    with _idle_bots_lock:
+        idle = _idle_bots.setdefault(bot.filepath, [])
+        if len(idle) < SANDBOX_MAX_IDLE_WORKERS:
+            idle.append(bot)
+            return
+    bot.close()
+
+
+def close_sandboxed_bots(filepath: str) -> None:
+    """Stop the idle workers of a bot file (after it was replaced or deleted)."""
+    with _idle_bots_lock:
+        idle = _idle_bots.pop(filepath, [])
+    for bot in idle:
+        bot.close()
@@ -0,0 +1,110 @@
+# Deadlines for bot calls, without signals.
+# signal.SIGALRM only works in the main thread and there is one alarm per
+# process, so it cannot time bots that play in worker threads (like the API's
+# threadpool) or several games at once. Instead, a single watchdog thread
+# keeps the deadlines of all threads and raises TimeoutError in a thread whose
+# deadline passed while it was still inside its deadline() block.
+
+import ctypes
+import heapq
+import itertools
+import os
+import threading
+from contextlib import contextmanager
+from time import perf_counter, sleep
+from typing import Any, List, Optional
+
+
+def _set_async_exc(thread_id: int, exc_type: Optional[type]) -> None:
+    """Raise exc_type in a thread, or cancel a pending one (if None)."""
+    ctypes.pythonapi.PyThreadState_SetAsyncExc(
+        ctypes.c_ulong(thread_id),
+        None if exc_type is None else ctypes.py_object(exc_type),
+    )
+
+
+class Watchdog:
+    """Enforces per-thread deadlines with one daemon thread per process.
+
+    The TimeoutError is raised asynchronously, between two bytecodes of the
+    running code, so a bot blocked inside a C call (like time.sleep) is only
+    stopped when that call returns; sandboxed bots (see bot_sandbox.py) are
+    killed instead. A bot that catches the TimeoutError still gets one when
+    its deadline() block ends.
+
+    A timed thread never takes a lock where the TimeoutError could interrupt
+    it and leave the lock held: when its block ends, it and the watchdog
+    race to take the claim lock of its deadline without blocking, and the
+    watchdog only raises the TimeoutError if it took the claim first."""
+
+    def __init__(self):
+        self.__condition = threading.Condition()
+        # Entries: [deadline, sequence number, thread id, claim, fired]
+        self.__deadlines: List[List[Any]] = []
+        self.__sequence = itertools.count()
+        self.__thread: Optional[threading.Thread] = None
+
+    def reset(self) -> None:
+        """Forget all deadlines and the watchdog thread (in a forked child)."""
+        self.__condition = threading.Condition()
+        self.__deadlines = []
+        self.__thread = None
+
+    @contextmanager
+    def deadline(self, timeout: float):
+        entry = [
+            perf_counter() + timeout,
+            next(self.__sequence),
+            threading.get_ident(),
+            threading.Lock(),
+            False,
+        ]
+        with self.__condition:
+            if self.__thread is None or not self.__thread.is_alive():
+                self.__thread = threading.Thread(
+                    target=self.__run, name="bot-watchdog", daemon=True
+                )
+                self.__thread.start()
+            heapq.heappush(self.__deadlines, entry)
+            if self.__deadlines[0] is entry:
+                self.__condition.notify()
+        try:
+            yield
+        finally:
+            fired = not entry[3].acquire(blocking=False)
+            if fired:
+                # Wait until the watchdog raised the TimeoutError, which may
+                # still be pending in this thread
+                while not entry[4]:
+                    sleep(0)
+                _set_async_exc(entry[2], None)
+        if fired:
+            raise TimeoutError(f"Bot did not answer within {timeout} seconds")
+
+    def __run(self) -> None:
+        with self.__condition:
+            while True:
+                deadlines = self.__deadlines
+                while deadlines and deadlines[0][3].locked():
+                    heapq.heappop(deadlines)
+                if not deadlines:
+                    self.__condition.wait()
+                    continue
+                delay = deadlines[0][0] - perf_counter()
+                if delay > 0:
+                    self.__condition.wait(delay)
+                    continue
+                entry = heapq.heappop(deadlines)
+                if entry[3].acquire(blocking=False):
+                    _set_async_exc(entry[2], TimeoutError)
+                    entry[4] = True
+
+
+_watchdog = Watchdog()
+os.register_at_fork(after_in_child=_watchdog.reset)
+
+
+def deadline(timeout: float):
+    """Context manager that raises TimeoutError in the current thread if its
+    block is still running after timeout seconds."""
+    return _watchdog.deadline(timeout)
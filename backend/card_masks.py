@@ -0,0 +1,189 @@
+# Card sets as 52-bit masks.
+# The mask functions below mirror the table functions of durak_game, and
+# test_card_masks checks them against those. They back the bots' legal
+# moves (legal_moves) and the card tracker; the engine itself still keeps
+# the hands, the table and the burn pile as lists, as its state is also
+# what the UI and the bots are given.
+
+from configurations import *
+from typing import List, Tuple, Optional, Iterable
+
+# A set of cards is stored as a 52-bit integer. Card (rank, suit) is bit
+# suit * 13 + rank, so every suit occupies 13 consecutive bits ordered by rank.
+NUM_OF_RANKS: int = len(RANKS)
+NUM_OF_SUITS: int = len(SUITS)
+FULL_DECK_MASK: int = (1 << (NUM_OF_RANKS * NUM_OF_SUITS)) - 1
+
+SUIT_MASKS: List[int] = [
+    ((1 << NUM_OF_RANKS) - 1) << (suit * NUM_OF_RANKS) for suit in range(NUM_OF_SUITS)
+]
+RANK_MASKS: List[int] = [
+    sum(1 << (suit * NUM_OF_RANKS + rank) for suit in range(NUM_OF_SUITS))
+    for rank in range(NUM_OF_RANKS)
+]
+
+
+def card_bit(card: Tuple[int, int]) -> int:
+    return 1 << (card[1] * NUM_OF_RANKS + card[0])
+
+
+def bit_to_card(bit_index: int) -> Tuple[int, int]:
+    return (bit_index % NUM_OF_RANKS, bit_index // NUM_OF_RANKS)
+
+
+CARDS: List[Tuple[int, int]] = [
+    bit_to_card(i) for i in range(NUM_OF_RANKS * NUM_OF_SUITS)
+]
+
+
+def _beating_mask(card: Tuple[int, int], kozar_suit: int) -> int:
+    rank, suit = card
+    # Higher cards of the same suit
+    mask = SUIT_MASKS[suit] & ~((card_bit(card) << 1) - 1)
+    if suit != kozar_suit:
+        mask |= SUIT_MASKS[kozar_suit]
+    return mask
+
+
+# BEATS[kozar_suit][bit_index] is the mask of all cards that beat that card.
+BEATS: List[List[int]] = [
+    [_beating_mask(card, kozar_suit) for card in CARDS]
+    for kozar_suit in range(NUM_OF_SUITS)
+]
+
+
+def mask_from_cards(card_list: Iterable[Optional[Tuple[int, int]]]) -> int:
+    mask = 0
+    for card in card_list:
+        if card is not None:
+            mask |= card_bit(card)
+    return mask
+
+
+def cards_from_mask(mask: int) -> List[Tuple[int, int]]:
+    """The cards of a mask, ordered by suit and then by rank."""
+    cards = []
+    while mask:
+        low_bit = mask & -mask
+        cards.append(CARDS[low_bit.bit_length() - 1])
+        mask ^= low_bit
+    return cards
+
+
+def mask_size(mask: int) -> int:
+    return mask.bit_count()
+
+
+def ranks_of_mask(mask: int) -> int:
+    """A 13-bit mask of the ranks present in a card mask."""
+    ranks = 0
+    for suit in range(NUM_OF_SUITS):
+        ranks |= mask >> (suit * NUM_OF_RANKS)
+    return ranks & ((1 << NUM_OF_RANKS) - 1)
+
+
+def can_add_rank(rank: int, table_mask: int) -> bool:
+    """Whether a card of this rank may join the attack on the table."""
+    return table_mask == 0 or bool(table_mask & RANK_MASKS[rank])
+
+
+def cards_that_beat(
+    hand_mask: int, attacking_card: Tuple[int, int], kozar_suit: int
+) -> int:
+    """The cards in the hand that can defend against the attacking card."""
+    rank, suit = attacking_card
+    return hand_mask & BEATS[kozar_suit][suit * NUM_OF_RANKS + rank]
+
+
+# The functions below mirror attack_with_card_list, defend_with_card_list and
+# forward_with_card_list in durak_game, but take the hand and the cards on the
+# table as masks. The table slots are still updated in place (their order
+# matters for the defence indexes), and the new masks are returned.
+
+
+def attack_with_card_mask(
+    attack: List[Optional[Tuple[int, int]]],
+    table_mask: int,
+    attacking_card_list: List[Tuple[int, int]],
+    hand_mask: int,
+) -> Tuple[List[Tuple[int, int]], int, int]:
+    """Returns the successful attacking cards, the new hand mask and the new
+    table mask."""
+    if attack and None not in attack:
+        return [], hand_mask, table_mask
+    successful_attacking_cards = []
+    for card in attacking_card_list:
+        bit = card_bit(card)
+        if not hand_mask & bit:
+            continue
+        if table_mask and not table_mask & RANK_MASKS[card[0]]:
+            continue
+        if None not in attack:
+            break
+        attack[attack.index(None)] = card
+        hand_mask ^= bit
+        table_mask |= bit
+        successful_attacking_cards.append(card)
+    return successful_attacking_cards, hand_mask, table_mask
+
+
+def defend_with_card_mask(
+    index_list: List[int],
+    defending_card_list: List[Tuple[int, int]],
+    attack: List[Optional[Tuple[int, int]]],
+    defence: List[Optional[Tuple[int, int]]],
+    table_mask: int,
+    hand_mask: int,
+    kozar_suit: int,
+) -> Tuple[List[Tuple[int, int]], List[int], int, int]:
+    """Returns the successful defending cards and indexes, the new hand mask and
+    the new table mask."""
+    beats = BEATS[kozar_suit]
+    successful_defending_cards = []
+    successful_index_list = []
+    for index, card in zip(index_list, defending_card_list):
+        if not isinstance(index, int):
+            continue
+        bit = card_bit(card)
+        if not hand_mask & bit:
+            continue
+        if index >= len(defence) or index < 0:
+            continue
+        attacking_card = attack[index]
+        if defence[index] is not None or attacking_card is None:
+            continue
+        if not beats[attacking_card[1] * NUM_OF_RANKS + attacking_card[0]] & bit:
+            continue
+        defence[index] = card
+        hand_mask ^= bit
+        table_mask |= bit
+        successful_defending_cards.append(card)
+        successful_index_list.append(index)
+    return successful_defending_cards, successful_index_list, hand_mask, table_mask
+
+
+def forward_with_card_mask(
+    forwarding_card_list: List[Tuple[int, int]],
+    attack: List[Optional[Tuple[int, int]]],
+    table_mask: int,
+    hand_mask: int,
+    num_of_allowed_forwarding_cards: int,
+) -> Tuple[List[Tuple[int, int]], int, int]:
+    """Returns the successful forwarding cards, the new hand mask and the new
+    table mask."""
+    attack_rank_mask = RANK_MASKS[attack[0][0]]
+    successful_forwarding_card_list = []
+    for card in forwarding_card_list:
+        if num_of_allowed_forwarding_cards <= 0:
+            break
+        bit = card_bit(card)
+        if not hand_mask & bit or not attack_rank_mask & bit:
+            continue
+        if None not in attack:
+            attack.append(None)
+        attack[attack.index(None)] = card
+        hand_mask ^= bit
+        table_mask |= bit
+        successful_forwarding_card_list.append(card)
+        num_of_allowed_forwarding_cards -= 1
+    return successful_forwarding_card_list, hand_mask, table_mask
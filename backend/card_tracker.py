@@ -0,0 +1,136 @@
+import copy
+from typing import Any, Dict, List, Tuple
+
+from card_masks import (
+    BEATS,
+    FULL_DECK_MASK,
+    NUM_OF_RANKS,
+    NUM_OF_SUITS,
+    card_bit,
+)
+
+Card = Tuple[int, int]
+
+
+class CardTracker:
+    """What a bot knows about the cards of a game.
+
+    Driven by the bot's notify_* hooks: call the tracker's method of the same
+    name from each of them. Every event costs O(1) per card, and the sets are
+    kept as card masks (see card_masks.py) next to counts by rank and suit, so
+    the queries below take constant time.
+
+    unseen: cards that were neither in my hand nor ever played to the table.
+    burned: cards that were burned.
+    known[p]: cards player p is known to hold, i.e. cards they took from the
+        table (and, for me, my hand)."""
+
+    def __init__(
+        self, num_of_players: int, my_index: int, hand: List[Card], kozar_suit: int
+    ):
+        self.my_index = my_index
+        self.kozar_suit = kozar_suit
+        self.unseen = FULL_DECK_MASK
+        self.unseen_count = NUM_OF_RANKS * NUM_OF_SUITS
+        self.unseen_rank_counts = [NUM_OF_SUITS] * NUM_OF_RANKS
+        self.unseen_suit_counts = [NUM_OF_RANKS] * NUM_OF_SUITS
+        self.burned = 0
+        self.burned_rank_counts = [0] * NUM_OF_RANKS
+        self.known = [0] * num_of_players
+        self.known_counts = [0] * num_of_players
+        self.known_rank_counts = [[0] * NUM_OF_RANKS for _ in range(num_of_players)]
+        self.__see(hand)
+        self.__add_known(my_index, hand)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The tracker as plain data (its masks and counts), for the bot's
+        state snapshots. from_dict builds the tracker back."""
+        return copy.deepcopy(self.__dict__)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CardTracker":
+        tracker = cls.__new__(cls)
+        tracker.__dict__.update(copy.deepcopy(data))
+        return tracker
+
+    def __see(self, card_list: List[Card]) -> None:
+        for card in card_list:
+            bit = card_bit(card)
+            if self.unseen & bit:
+                self.unseen ^= bit
+                self.unseen_count -= 1
+                self.unseen_rank_counts[card[0]] -= 1
+                self.unseen_suit_counts[card[1]] -= 1
+
+    def __add_known(self, player_index: int, card_list: List[Card]) -> None:
+        for card in card_list:
+            bit = card_bit(card)
+            if not self.known[player_index] & bit:
+                self.known[player_index] |= bit
+                self.known_counts[player_index] += 1
+                self.known_rank_counts[player_index][card[0]] += 1
+
+    def __play(self, player_index: int, card_list: List[Card]) -> None:
+        self.__see(card_list)
+        for card in card_list:
+            bit = card_bit(card)
+            if self.known[player_index] & bit:
+                self.known[player_index] ^= bit
+                self.known_counts[player_index] -= 1
+                self.known_rank_counts[player_index][card[0]] -= 1
+
+    def notify_first_attack(self, attacker_index: int, card_list: List[Card]):
+        self.__play(attacker_index, card_list)
+
+    def notify_optional_attack(self, attacker_index: int, card_list: List[Card]):
+        self.__play(attacker_index, card_list)
+
+    def notify_defence(
+        self, defender_index: int, defending_cards: List[Card], indexes: List[int]
+    ):
+        self.__play(defender_index, defending_cards)
+
+    def notify_forward(self, forwarder_index: int, card_list: List[Card]):
+        self.__play(forwarder_index, card_list)
+
+    def notify_take(self, defender_index: int, card_list: List[Card]):
+        self.__add_known(defender_index, card_list)
+
+    def notify_burn(self, card_list: List[Card]):
+        for card in card_list:
+            bit = card_bit(card)
+            if not self.burned & bit:
+                self.burned |= bit
+                self.burned_rank_counts[card[0]] += 1
+
+    def notify_cards_drawn_to_hand(self, card_list: List[Card]):
+        self.__see(card_list)
+        self.__add_known(self.my_index, card_list)
+
+    def unseen_of_rank(self, rank: int) -> int:
+        return self.unseen_rank_counts[rank]
+
+    def unseen_of_suit(self, suit: int) -> int:
+        return self.unseen_suit_counts[suit]
+
+    def burned_of_rank(self, rank: int) -> int:
+        return self.burned_rank_counts[rank]
+
+    def known_of_rank(self, player_index: int, rank: int) -> int:
+        return self.known_rank_counts[player_index][rank]
+
+    def unknown_cards_in_hand(self, player_index: int, hand_size: int) -> int:
+        """How many of a player's cards we know nothing about."""
+        return hand_size - self.known_counts[player_index]
+
+    def unseen_that_beat(self, card: Card) -> int:
+        """Mask of the unseen cards that beat a card."""
+        return BEATS[self.kozar_suit][card[1] * NUM_OF_RANKS + card[0]] & self.unseen
+
+    def known_that_beat(self, player_index: int, card: Card) -> int:
+        """Mask of the cards a player is known to hold that beat a card."""
+        beats = BEATS[self.kozar_suit][card[1] * NUM_OF_RANKS + card[0]]
+        return beats & self.known[player_index]
+
+    def is_unseen(self, card: Card) -> bool:
+        return bool(self.unseen & card_bit(card))
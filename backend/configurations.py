@@ -1,9 +1,19 @@
-from typing import List
+from typing import List, Optional
 CARDS_PER_HAND: int = 6
 STARTING_MAX_ATTACK_SIZE: int = 5
 MAX_ATTACK_SIZE_AFTER_BURN: int = 6
 MAX_TIME_PER_TURN: float = 0.01
+MAX_NUM_OF_STEPS: int = 700  # Limit to prevent infinite loops
 RANKS: List[str] = ["2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A"]
 SUITS: List[str] = ["♣", "♦", "♥", "♠"]
 USE_TIMING: bool = False
-USE_FIXED_DECK: bool = False
\ No newline at end of file
+FIXED_GAME_SEED: Optional[int] = None  # Play every API and CLI game with this seed
+SANDBOX_BOTS: bool = False  # Run the bots of API games in worker processes
+SANDBOX_MAX_TIME_PER_CALL: float = 1.0  # Limit for sandboxed bots without USE_TIMING
+SANDBOX_START_TIMEOUT: float = 10.0  # Seconds for a worker to load its bot file
+SANDBOX_MEMORY_LIMIT_MB: int = 512  # Address space of a sandboxed bot's worker
+SANDBOX_CPU_TIME_PER_GAME: float = 60.0  # CPU seconds of a sandboxed bot per game
+SANDBOX_MAX_IDLE_WORKERS: int = 4  # Idle workers kept per bot file
+MAX_CONCURRENT_TOURNAMENTS: int = 1  # Later tournament jobs wait in a queue
+GAME_IDLE_TIMEOUT: float = 1800.0  # Seconds before an untouched API game is dropped
+TIME_BANK_PER_GAME: Optional[float] = None  # Seconds per bot for a whole game
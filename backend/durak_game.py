@@ -1,29 +1,38 @@
 from durak_actions import Output_actions, Input_actions
+from game_log import GameLog, DEBUG, INFO, WARNING, ERROR
+from bot_clock import BotClock
+from bot_watchdog import deadline
+from legal_moves import (
+    legal_attacks,
+    legal_defences,
+    legal_forwards,
+    forwarding_allowance,
+)
 from configurations import *
-from random import shuffle, choice
-from typing import List, Tuple, Optional, Any, Dict
+import random
+from typing import List, Tuple, Optional, Any, Dict, Iterator, Deque
+from collections import deque
 from inspect import currentframe
-from time import time
-import signal
+from time import time, perf_counter, thread_time
 
 
 def pretty_print_state(state):
     print("Game State:")
-    print(f"Trump Suit: {state['trump_suit']}")
-    print(f"Trump Card: {state['trump_card']}")
+    print(f"Trump Suit: {SUITS[state['trump_suit']]}")
+    print(f"Trump Card: {card_tuple_to_str(state['trump_card'])}")
     print("Hands:")
     for i, hand in enumerate(state["hands"]):
-        print(f"  Player {i}: {', '.join(hand)}")
+        print(f"  Player {i}: {', '.join(card_list_tuples_to_strs(hand))}")
     print(f"Attacker: Player {state['attacker']}")
     print(f"Defender: Player {state['defender']}")
     print(f"Current Player: Player {state.get('curr_player', -1)}")
-    print(f"Table Attack: {state['table_attack']}")
-    print(f"Table Defence: {state['table_defence']}")
+    print(f"Table Attack: {card_list_tuples_to_strs(state['table_attack'])}")
+    print(f"Table Defence: {card_list_tuples_to_strs(state['table_defence'])}")
     print(f"Burn: {state['burn']}")
     print(f"Number of Burned Cards: {state['num_of_burned_cards']}")
     print("Deck:")
     for i, card in enumerate(state["deck"]):
-        print(f"{card}", end="  " if i % 10 != 9 else "\n")
+        print(f"{card_tuple_to_str(card)}", end="  " if i % 10 != 9 else "\n")
     print(f"Deck Count: {state['deck_count']}")
 
 
@@ -39,58 +48,153 @@ def card_str_to_tuple(card_str: Optional[str]) -> Optional[Tuple[int, int]]:
     return (RANKS.index(rank), SUITS.index(suit))
 
 
-def __call_bot_subprocess(q, bot, args, kwargs):
-    f = open("file.txt", "w")
-    f.write("Subprocess started\n")
-    f.close()
+class OutOfTime(TimeoutError):
+    """Raised by call_bot instead of calling a bot whose time bank is used up.
+    The call that used it up already failed (with a TimeoutError), so the
+    engine falls back quietly: the bot is not called again in the game."""
+
+
+def call_bot(
+    bot,
+    *args,
+    timeout: float = MAX_TIME_PER_TURN,
+    clock: Optional[BotClock] = None,
+    bot_index: int = 0,
+    **kwargs,
+):
+    """Call a bot (args are those of AbstractBot.call). The call is limited to
+    timeout seconds if USE_TIMING is on. If a clock is given, the call is
+    recorded on it as a call of bot_index, and with a time bank the call may
+    only use the time left in the bank: a call that used up the bank is
+    discarded (raising TimeoutError), and a bot that is out of time is not
+    called (raising OutOfTime)."""
+    time_limit = timeout if USE_TIMING else None
+    if clock is None:
+        return _call_bot_with_time_limit(bot, time_limit, *args, **kwargs)
+    time_left = clock.time_left(bot_index)
+    if time_left is not None:
+        if time_left <= 0:
+            raise OutOfTime("Out of time")
+        time_limit = time_left if time_limit is None else min(time_limit, time_left)
+    start_wall = perf_counter()
+    start_cpu = thread_time()
     try:
-        result = bot.call(*args, **kwargs)
-        q.put(("ok", result))
-    except Exception as e:
-        q.put(("err", e))
-
-
-def call_bot(bot, *args, timeout: float = MAX_TIME_PER_TURN, **kwargs):
-    if not USE_TIMING:
+        result = _call_bot_with_time_limit(bot, time_limit, *args, **kwargs)
+    finally:
+        wall = perf_counter() - start_wall
+        if getattr(bot, "sandboxed", False):
+            cpu = bot.last_cpu_time
+        else:
+            cpu = thread_time() - start_cpu
+        clock.record(bot_index, args[0][0], cpu, wall)
+    if time_left is not None and wall >= time_left:
+        raise TimeoutError("Out of time")
+    return result
+
+
+def _call_bot_with_time_limit(bot, time_limit: Optional[float], *args, **kwargs):
+    if getattr(bot, "sandboxed", False):
+        # Sandboxed bots are timed by their proxy, in wall-clock and CPU time
+        if time_limit is None:
+            time_limit = SANDBOX_MAX_TIME_PER_CALL
+        return bot.call(*args, timeout=time_limit, cpu_budget=time_limit, **kwargs)
+    if time_limit is None:
         return bot.call(*args, **kwargs)
-
-    def raise_timeout_error(*args):
-        raise TimeoutError
-
-    signal.signal(signal.SIGALRM, raise_timeout_error)
-    signal.setitimer(signal.ITIMER_REAL, timeout)
-    try:
+    # A per-thread deadline, so bots can be timed in any thread
+    with deadline(time_limit):
         return bot.call(*args, **kwargs)
-    except Exception as e:
-        raise e
-    finally:
-        signal.setitimer(signal.ITIMER_REAL, 0)
 
 
-def inform(player_bot: Any, message: Any, params: Tuple, state: Any) -> Any:
+def inform(
+    player_bot: Any,
+    message: Any,
+    params: Tuple,
+    state: Any,
+    clock: Optional[BotClock] = None,
+    bot_index: int = 0,
+) -> Any:
     # message, parameters, bot_state
+    if getattr(player_bot, "sandboxed", False) and not player_bot.is_alive():
+        # The bot's worker died (failing the call that found out): it is not
+        # called again for the rest of the game
+        return None
     try:
-        return call_bot(player_bot, message, *params, state)
+        return call_bot(
+            player_bot, message, *params, state, clock=clock, bot_index=bot_index
+        )
+    except OutOfTime:
+        return None
     except Exception as e:
         print(f"\nline {currentframe().f_lineno}: Exception in inform calling player {player_bot} with {message}: {e}")
         return None
 
 
+class StepParams:
+    """The parameters of the bot calls of a notification (see AbstractBot.call),
+    by player index. The table and the hand sizes are taken once, as tuples
+    shared by all the recipients, so a bot can change neither the engine's
+    state nor what the other bots see. A player's hand is sliced when it is
+    requested: it is the hand as it was when the parameters were built, so
+    hands may only have grown since."""
+
+    __slots__ = (
+        "hands",
+        "table_attack",
+        "table_defence",
+        "cards_per_hand",
+        "defender",
+        "deck_count",
+    )
+
+    def __init__(
+        self,
+        hands: List[List[Tuple[int, int]]],
+        table_attack: List[Optional[Tuple[int, int]]],
+        table_defence: List[Optional[Tuple[int, int]]],
+        defender: int,
+        deck_count: int,
+    ):
+        self.hands = hands
+        self.table_attack = tuple(table_attack)
+        self.table_defence = tuple(table_defence)
+        self.cards_per_hand = tuple(map(len, hands))
+        self.defender = defender
+        self.deck_count = deck_count
+
+    def __getitem__(self, player_index: int) -> Tuple:
+        return (
+            self.hands[player_index][: self.cards_per_hand[player_index]],
+            self.table_attack,
+            self.table_defence,
+            self.cards_per_hand,
+            self.defender,
+            self.deck_count,
+        )
+
+
 def inform_all(
     bots: List[Any],
     index_list: List[int],
     message: Any,
-    params_list: List[Tuple],
+    params: StepParams,
     states: List[Any],
-    log: List[List[str]],
+    log: Optional[GameLog],
+    clock: Optional[BotClock] = None,
 ) -> None:
-    for bot_index, params in zip(index_list, params_list):
-        result = inform(bots[bot_index], message, params, states[bot_index])
+    for bot_index in index_list:
+        result = inform(
+            bots[bot_index],
+            message,
+            params[bot_index],
+            states[bot_index],
+            clock,
+            bot_index,
+        )
         if isinstance(result, dict):
             if "state" in result:
                 states[bot_index] = result["state"]
-            if "log" in result and isinstance(result["log"], list):
-                log[bot_index].extend(result["log"])
+            if log is not None and isinstance(result.get("log"), list):
+                log.extend(bot_index, result["log"])
 
 
 def card_tuple_to_str(card_tuple: Optional[Tuple[int, int]]) -> str:
@@ -107,6 +211,43 @@ def card_list_tuples_to_strs(hand: List[Optional[Tuple[int, int]]]) -> List[str]
     return [card_tuple_to_str(c) for c in hand]
 
 
+class LogCards:
+    """A card list argument of a log message. It is only rendered (like
+    card_list_tuples_to_strs) if the message is formatted."""
+
+    __slots__ = ("cards",)
+
+    def __init__(self, cards: List[Optional[Tuple[int, int]]]):
+        self.cards = cards
+
+    def __str__(self) -> str:
+        return str(card_list_tuples_to_strs(self.cards))
+
+
+def set_bots_log_level(bots: List[Any], log: Optional[GameLog]) -> None:
+    """Keep the bots from building log messages that the game's log would
+    drop: logging is off for a game without a log."""
+    level = None if log is None else log.level
+    for bot in bots:
+        if hasattr(bot, "set_log_level"):
+            bot.set_log_level(level)
+
+
+def render_state(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of the engine state with every card rendered as a display
+    string (like '10♥'), as expected by the UI. The engine itself keeps cards
+    as (rank, suit) tuples for the whole game."""
+    return {
+        **state,
+        "trump_suit": SUITS[state["trump_suit"]],
+        "trump_card": card_tuple_to_str(state["trump_card"]),
+        "hands": [card_list_tuples_to_strs(h) for h in state["hands"]],
+        "table_attack": card_list_tuples_to_strs(state["table_attack"]),
+        "table_defence": card_list_tuples_to_strs(state["table_defence"]),
+        "deck": card_list_tuples_to_strs(state["deck"]),
+    }
+
+
 def valid_card_format(card: Any) -> bool:
     return (
         isinstance(card, tuple)
@@ -164,15 +305,85 @@ def valid_action_format(action: Any) -> bool:
     return False
 
 
-def init_deck() -> List[Tuple[int, int]]:
-    deck = list()
-    for i in range(13):
-        for j in range(4):
-            deck.append((i, j))
-    shuffle(deck)
+def create_deck(rng: Any = random) -> List[Tuple[int, int]]:
+    deck = [(r, s) for s in range(len(SUITS)) for r in range(len(RANKS))]
+    rng.shuffle(deck)
     return deck
 
 
+def draw_cards(deck: Deque[Tuple[int, int]], count: int) -> List[Tuple[int, int]]:
+    """Take (up to) count cards from the top of the deck."""
+    return [deck.popleft() for _ in range(min(count, len(deck)))]
+
+
+def deal_players(
+    deck: Deque[Tuple[int, int]], num_players: int
+) -> List[List[Tuple[int, int]]]:
+    # One card to every player in turn, CARDS_PER_HAND times
+    dealt = draw_cards(deck, CARDS_PER_HAND * num_players)
+    return [dealt[j::num_players] for j in range(num_players)]
+
+
+def new_game_state(
+    deck: List[Tuple[int, int]], num_of_players: int, rng: Any = random
+) -> Dict[str, Any]:
+    """Deal the (already shuffled) deck and build the initial engine state.
+    The last card of the deck is the trump card. The state keeps the rest of
+    the deck as a deque, which the engine draws from the left."""
+    deck = deque(deck)
+    trump_card = deck[-1]
+    trump_suit = trump_card[1]
+    hands = deal_players(deck, num_of_players)
+    # Find attacker: player with the lowest trump card (lowest rank of trump suit)
+    lowest_trump = 20
+    attacker = rng.randint(0, num_of_players - 1)
+    for i, hand in enumerate(hands):
+        trump_cards = [c[0] for c in hand if c[1] == trump_suit]
+        if trump_cards:
+            min_trump = min(trump_cards)
+            if min_trump < lowest_trump:
+                lowest_trump = min_trump
+                attacker = i
+    if lowest_trump > len(RANKS):
+        lowest_trump = -1
+    defender = (attacker + 1) % num_of_players
+    # Cards are kept as (rank, suit) tuples for the whole game; use
+    # render_state() to get the display strings the UI expects.
+    return {
+        "trump_suit": trump_suit,
+        "trump_card": trump_card,  # a (rank, suit) tuple
+        "lowest_trump": lowest_trump,  # if there is no trump, it is marked as -1.
+        "hands": hands,
+        "table_attack": [],
+        "table_defence": [],
+        "attacker": attacker,
+        "defender": defender,
+        "curr_player": attacker,
+        "bot_states": [{} for _ in range(num_of_players)],
+        "burn": False,
+        "num_of_burned_cards": 0,
+        "deck": deck,
+        "deck_count": len(deck),  # Add deck count to state
+    }
+
+
+def in_place_bot_states(bots: List[Any]) -> List[Optional[Dict[str, Any]]]:
+    """Initial bot_states for bot instances that live for the whole game.
+    A None entry makes the engine leave the state on the bot instead of
+    merging and storing it on every call (use snapshot_bot_states to get it).
+    Bots without snapshot_state get their state passed around as before."""
+    return [None if hasattr(bot, "snapshot_state") else {} for bot in bots]
+
+
+def snapshot_bot_states(
+    bot_states: List[Optional[Dict[str, Any]]], bots: List[Any]
+) -> List[Dict[str, Any]]:
+    return [
+        bot.snapshot_state() if bot_state is None else bot_state
+        for bot_state, bot in zip(bot_states, bots)
+    ]
+
+
 def real_cards(card_list: List[Optional[Tuple[int, int]]]) -> List[Tuple[int, int]]:
     return [card for card in card_list if card is not None]
 
@@ -313,9 +524,80 @@ def make_table_size_of_max_attack_size(
     return table_attack, table_defence
 
 
+def padded_table(
+    state: Dict[str, Any],
+) -> Tuple[List[Optional[Tuple[int, int]]], List[Optional[Tuple[int, int]]]]:
+    """Copies of the attack and defence of a state, with an empty slot for
+    every card that may still be attacked with (as a step sees the table)."""
+    table_attack = list(state["table_attack"])
+    table_defence = list(state["table_defence"])
+    max_attack_size = min(
+        len(state["hands"][state["defender"]]),
+        MAX_ATTACK_SIZE_AFTER_BURN if state["burn"] else STARTING_MAX_ATTACK_SIZE,
+    )
+    if not table_attack or all(card is None for card in table_attack):
+        table_attack, table_defence = make_table_size_of_max_attack_size(
+            table_attack, table_defence, max_attack_size
+        )
+    if len(table_defence) < max_attack_size:
+        table_defence.extend([None] * (max_attack_size - len(table_defence)))
+    if len(table_attack) < max_attack_size:
+        table_attack.extend([None] * (max_attack_size - len(table_attack)))
+    return table_attack, table_defence
+
+
+def legal_actions(state: Dict[str, Any], player: int) -> Iterator[List[Any]]:
+    """Generate the actions the engine accepts from a player in the next step,
+    in the format bots return them, one card per action:
+    the defender may take, defend a card ([DEFEND, [card], [index]]) or
+    forward ([FORWARD, [card]]); an attacker may attack with a card
+    ([ATTACK, [card]]) or pass (except in the first attack).
+    Nothing is generated if it is not the player's turn, or if the table is
+    about to be burned."""
+    if player != state["curr_player"]:
+        return
+    hand = state["hands"][player]
+    defender = state["defender"]
+    table_attack, table_defence = padded_table(state)
+    if player == defender:
+        if all(
+            table_defence[index] != None or table_attack[index] == None
+            for index in range(len(table_attack))
+        ):
+            return
+        yield [Output_actions.TAKE]
+        for card, index in legal_defences(
+            hand, table_attack, table_defence, state["trump_suit"]
+        ):
+            yield [Output_actions.DEFEND, [card], [index]]
+        allowance = forwarding_allowance(
+            [len(h) for h in state["hands"]],
+            table_attack,
+            defender,
+            len(state.get("deck", [])),
+        )
+        for card in legal_forwards(hand, table_attack, table_defence, allowance):
+            yield [Output_actions.FORWARD, [card]]
+        return
+    if any(card is not None for card in table_attack):
+        yield [Output_actions.PASS]
+    for card in legal_attacks(hand, table_attack, table_defence):
+        yield [Output_actions.ATTACK, [card]]
+
+
 def advance_game_step(
-    state: Dict[str, Any], bots: List[Any], bot_names: Optional[List[str]] = None
+    state: Dict[str, Any],
+    bots: List[Any],
+    bot_names: Optional[List[str]] = None,
+    log: Optional[GameLog] = None,
+    rng: Any = random,
+    clock: Optional[BotClock] = None,
 ) -> Dict[str, Any]:
+    """Play a single step of the game and return the new state.
+    Log entries of this step are appended to log, which is kept outside the
+    state so it is never copied (if not given, no log is kept).
+    rng is used for the random decisions of the engine, and the bot calls
+    are timed on clock (if given)."""
 
     if bot_names is None:
         bot_names = [f"Bot {i}" for i in range(len(bots))]
@@ -324,7 +606,7 @@ def advance_game_step(
     attacker = state["attacker"]
     defender = state["defender"]
     lowest_trump = state["lowest_trump"]
-    hands = [card_list_strs_to_tuples(h) for h in state["hands"]]
+    hands = [list(h) for h in state["hands"]]
 
     def get_next_player(idx: int) -> int:
         deck = state.get("deck", [])
@@ -336,53 +618,34 @@ def advance_game_step(
                 return ni
         return idx
 
+    # Every player is active while the deck has cards
+    all_players = list(range(num_of_players))
+
     def get_active_players():
-        deck = state.get("deck", [])
-        return [i for i in range(num_of_players) if deck or len(hands[i]) != 0]
+        if state.get("deck"):
+            return all_players
+        return [i for i in all_players if len(hands[i]) != 0]
 
-    table_attack = [card_str_to_tuple(c) for c in state["table_attack"]]
-    table_defence = [card_str_to_tuple(c) for c in state["table_defence"]]
-    max_attack_size = min(
-        len(hands[defender]),
-        MAX_ATTACK_SIZE_AFTER_BURN if state["burn"] else STARTING_MAX_ATTACK_SIZE,
-    )
-    if not table_attack or all(card is None for card in table_attack):
-        table_attack, table_defence = make_table_size_of_max_attack_size(
-            table_attack, table_defence, max_attack_size
-        )
-    if len(table_defence) < max_attack_size:
-        table_defence.extend([None] * (max_attack_size - len(table_defence)))
-    if len(table_attack) < max_attack_size:
-        table_attack.extend([None] * (max_attack_size - len(table_attack)))
+    table_attack, table_defence = padded_table(state)
     end_of_round = False
     is_defence_successful = (
         True  # If the attack is successful, the defender will be the next player
     )
-    trump_suit = SUITS.index(state["trump_suit"])
-    # log is now a list of lists, one per bot
-    log = [l[:] for l in state["log"]]
+    trump_suit = state["trump_suit"]
     bot_states = state.get("bot_states", [{} for _ in bots])
     curr_player = state["curr_player"]
     # Add a status list per bot if not present
     status = state.get("status", ["" for _ in bots])
     did_game_init_occur: bool = state.get("did_game_init_occur", False)
 
-    def get_params_list():
-        return [
-            (
-                hands[player_index].copy(),
-                table_attack.copy(),
-                table_defence.copy(),
-                [len(hand) for hand in hands],
-                defender,
-                state["deck_count"],
-            )
-            for player_index in get_active_players()
-        ]
+    def get_step_params():
+        return StepParams(
+            hands, table_attack, table_defence, defender, state["deck_count"]
+        )
 
     if not did_game_init_occur:
 
-        params_list = get_params_list()
+        step_params = get_step_params()
         for player_index, bot in enumerate(bots):
             result = inform(
                 bot,
@@ -390,19 +653,21 @@ def advance_game_step(
                     Input_actions.GAME_INIT,
                     num_of_players,
                     player_index,
-                    hands[player_index],
-                    card_str_to_tuple(state["trump_card"]),
+                    hands[player_index].copy(),
+                    state["trump_card"],
                     attacker,
                     lowest_trump,
                 ),
-                params_list[player_index],
+                step_params[player_index],
                 bot_states[player_index],
+                clock,
+                player_index,
             )
             if isinstance(result, dict):
                 if "state" in result:
                     bot_states[player_index] = result["state"]
-                if "log" in result:
-                    log[player_index].extend(result["log"])
+                if "log" in result and log is not None:
+                    log.extend(player_index, result["log"])
                 if "status" in result:
                     set_status(player_index, result["status"])
         did_game_init_occur = True
@@ -413,13 +678,17 @@ def advance_game_step(
             bots,
             get_active_players(),
             (Input_actions.TAKE_PASSIVE, defender, tuple(cards_to_hand)),
-            get_params_list(),
+            get_step_params(),
             bot_states,
             log,
+            clock,
         )
         add_log(
             defender,
-            f"Player {defender} took cards: {card_list_tuples_to_strs(cards_to_hand)}",
+            INFO,
+            "Player {} took cards: {}",
+            defender,
+            LogCards(cards_to_hand),
         )
         for card in cards_to_hand:
             hands[defender].append(card)
@@ -427,7 +696,7 @@ def advance_game_step(
     # --- WINNER DETECTION AND REMOVAL ---
     # Helper to mark winners and remove them from the round
     def update_winners_and_remove():
-        nonlocal hands, bots, bot_names, log, status, attacker, defender, curr_player, num_of_players
+        nonlocal hands, bots, bot_names, status, attacker, defender, curr_player, num_of_players
         # Mark as "WON" if hand is empty and not already marked
         for i, hand in enumerate(hands):
             if len(hand) == 0 and status[i] != "WON":
@@ -436,11 +705,12 @@ def advance_game_step(
                     bots,
                     get_active_players(),
                     (Input_actions.WINNER_PASSIVE, curr_player),
-                    get_params_list(),
+                    get_step_params(),
                     bot_states,
                     log,
+                    clock,
                 )
-                add_log(i, f"Player {i} has WON!")
+                add_log(i, INFO, "Player {} has WON!", i)
         # Remove all players who have won from the round (but keep them in the state for UI)
         # Only active players participate in the round
         active_indices = [i for i, hand in enumerate(hands) if len(hand) > 0]
@@ -460,14 +730,19 @@ def advance_game_step(
         # If only one player left, game is over (handled by frontend/end condition)
 
     # Helper to add a log entry for a specific bot
-    def add_log(bot_idx, entry):
-        if 0 <= bot_idx < len(log) and isinstance(entry, str):
+    def add_log(bot_idx, level, message, *args):
+        # The message (a str.format template) is only formatted if it is kept
+        if log is None or not log.is_enabled_for(level):
+            return
+        if 0 <= bot_idx < len(log) and isinstance(message, str):
+            if args:
+                message = message.format(*args)
             ts = time()
-            log[bot_idx].append(f"[TS:{ts}]Game: {entry}")
+            log.append(bot_idx, f"[TS:{ts}]Game: {message}")
 
     def add_logs(bot_idx, entries):
-        if 0 <= bot_idx < len(log):
-            log[bot_idx].extend(entries)
+        if log is not None and 0 <= bot_idx < len(log):
+            log.extend(bot_idx, entries)
 
     # Helper to set a status entry for a specific bot
     def set_status(bot_idx, entry):
@@ -485,14 +760,18 @@ def advance_game_step(
                 bots,
                 get_active_players(),
                 (Input_actions.BURN, burned_cards),
-                get_params_list(),
+                get_step_params(),
                 bot_states,
                 log,
+                clock,
             )
             state["burn"] = True
             add_log(
                 defender,
-                f"Player {defender} burned cards: {card_list_tuples_to_strs(burned_cards)}",
+                INFO,
+                "Player {} burned cards: {}",
+                defender,
+                LogCards(burned_cards),
             )
             end_of_round = True
             is_defence_successful = True
@@ -508,16 +787,21 @@ def advance_game_step(
                 result = call_bot(
                     bots[curr_player],
                     (Input_actions.DEFENCE,),
-                    hands[curr_player].copy(),
-                    table_attack.copy(),
-                    table_defence.copy(),
-                    [len(hand) for hand in hands],
-                    defender,
-                    state["deck_count"],
+                    *get_step_params()[curr_player],
                     bot_states[curr_player],
+                    clock=clock,
+                    bot_index=curr_player,
                 )
+            except OutOfTime:
+                result = Output_actions.TAKE
             except Exception as e:
-                add_log(curr_player, f"Error in defence of player {curr_player}: {e}")
+                add_log(
+                    curr_player,
+                    ERROR,
+                    "Error in defence of player {}: {}",
+                    curr_player,
+                    e,
+                )
                 result = Output_actions.TAKE
             # If bot returns dict, extract log/status
             if isinstance(result, dict):
@@ -553,20 +837,24 @@ def advance_game_step(
                                 successful_defending_cards,
                                 successful_index_list,
                             ),
-                            get_params_list(),
+                            get_step_params(),
                             bot_states,
                             log,
+                            clock,
                         )
                         add_log(
                             curr_player,
-                            f"Player {curr_player} defended with {card_list_tuples_to_strs(successful_defending_cards)}",
+                            INFO,
+                            "Player {} defended with {}",
+                            curr_player,
+                            LogCards(successful_defending_cards),
                         )
                     else:
                         take()
                         end_of_round = True
                         is_defence_successful = False
 
-                        add_log(curr_player, f"Player {curr_player} took cards")
+                        add_log(curr_player, INFO, "Player {} took cards", curr_player)
                 elif action[0] == Output_actions.FORWARD:
                     num_of_allowed_forwarding_cards = len(
                         hands[get_next_player(defender)]
@@ -580,7 +868,7 @@ def advance_game_step(
                         take()
                         end_of_round = True
                         is_defence_successful = False
-                        add_log(defender, f"Player {defender} took cards")
+                        add_log(defender, INFO, "Player {} took cards", defender)
                     else:
                         forwarding_card_list = action[1]
                         successful_forwarding_card_list = forward_with_card_list(
@@ -598,13 +886,17 @@ def advance_game_step(
                                     defender,
                                     successful_forwarding_card_list,
                                 ),
-                                get_params_list(),
+                                get_step_params(),
                                 bot_states,
                                 log,
+                                clock,
                             )
                             add_log(
                                 defender,
-                                f"Player {defender} forwarded cards {card_list_tuples_to_strs(successful_forwarding_card_list)}",
+                                INFO,
+                                "Player {} forwarded cards {}",
+                                defender,
+                                LogCards(successful_forwarding_card_list),
                             )
                             defender = get_next_player(defender)
                             allowed_attack_length = len(hands[defender])
@@ -615,19 +907,28 @@ def advance_game_step(
                             table_attack = table_attack[:allowed_attack_length]
                             table_defence = table_defence[:allowed_attack_length]
                         else:
-                            add_log(defender, "No valid forwarding cards, taking cards")
+                            add_log(
+                                defender,
+                                WARNING,
+                                "No valid forwarding cards, taking cards",
+                            )
                             take()
                             end_of_round = True
                             is_defence_successful = False
-                            add_log(defender, f"Player {defender} took cards")
+                            add_log(defender, INFO, "Player {} took cards", defender)
                 else:
                     take()
                     end_of_round = True
                     is_defence_successful = False
-                    add_log(curr_player, f"Player {curr_player} took cards")
+                    add_log(curr_player, INFO, "Player {} took cards", curr_player)
 
             else:
-                add_log(curr_player, f"Invalid defence action: {action}. Taking cards.")
+                add_log(
+                    curr_player,
+                    WARNING,
+                    "Invalid defence action: {}. Taking cards.",
+                    action,
+                )
                 take()
                 end_of_round = True
                 is_defence_successful = False
@@ -642,16 +943,21 @@ def advance_game_step(
                         else Input_actions.OPTIONAL_ATTACK
                     ),
                 ),
-                hands[curr_player].copy(),
-                table_attack.copy(),
-                table_defence.copy(),
-                [len(hand) for hand in hands],
-                defender,
-                state["deck_count"],
+                *get_step_params()[curr_player],
                 bot_states[curr_player],
+                clock=clock,
+                bot_index=curr_player,
             )
+        except OutOfTime:
+            result = Output_actions.PASS
         except Exception as e:
-            add_log(curr_player, f"Bot {bot_names[curr_player]} raised an exception during attack: {e}. Passing.\n")
+            add_log(
+                curr_player,
+                ERROR,
+                "Bot {} raised an exception during attack: {}. Passing.\n",
+                bot_names[curr_player],
+                e,
+            )
             result = Output_actions.PASS
         if isinstance(result, dict):
             action = result.get("action")
@@ -682,21 +988,27 @@ def advance_game_step(
                         curr_player,
                         successful_attacking_cards,
                     ),
-                    get_params_list(),
+                    get_step_params(),
                     bot_states,
                     log,
+                    clock,
                 )
                 add_log(
                     curr_player,
-                    f"Player {curr_player} attacked with {card_list_tuples_to_strs(successful_attacking_cards)}",
+                    INFO,
+                    "Player {} attacked with {}",
+                    curr_player,
+                    LogCards(successful_attacking_cards),
                 )
             if not is_succesful_attack:
                 # If this is the first attack (all table_attack are None), pick a random card from hand and attack with it
                 if hands[curr_player]:
-                    random_card = choice(hands[curr_player])
+                    random_card = rng.choice(hands[curr_player])
                     add_log(
                         curr_player,
-                        f"Invalid first attack action. Forcing attack with random card from hand: {random_card}"
+                        WARNING,
+                        "Invalid first attack action. Forcing attack with random card from hand: {}",
+                        random_card,
                     )
                     card_singelton: List[Tuple[int, int]] = attack_with_card_list(
                         table_attack, table_defence, [random_card], hands[curr_player]
@@ -712,13 +1024,17 @@ def advance_game_step(
                             curr_player,
                             [random_card],
                         ),
-                        get_params_list(),
+                        get_step_params(),
                         bot_states,
                         log,
+                        clock,
                     )
                     add_log(
                         curr_player,
-                        f"Player {curr_player} attacked with {card_list_tuples_to_strs([random_card])} (forced random)",
+                        INFO,
+                        "Player {} attacked with {} (forced random)",
+                        curr_player,
+                        LogCards([random_card]),
                     )
                 else:
                     raise ValueError(
@@ -742,71 +1058,81 @@ def advance_game_step(
                         curr_player,
                         successful_attacking_cards,
                     ),
-                    get_params_list(),
+                    get_step_params(),
                     bot_states,
                     log,
+                    clock,
                 )
                 add_log(
                     curr_player,
-                    f"Player {curr_player} attacked with {card_list_tuples_to_strs(successful_attacking_cards)}",
+                    INFO,
+                    "Player {} attacked with {}",
+                    curr_player,
+                    LogCards(successful_attacking_cards),
                 )
             else:
                 inform_all(
                     bots,
                     get_active_players(),
                     (Input_actions.PASS_PASSIVE, curr_player),
-                    get_params_list(),
+                    get_step_params(),
                     bot_states,
                     log,
+                    clock,
+                )
+                add_log(
+                    curr_player, INFO, "Unsuccessful attack. Player {} passes", curr_player
                 )
-                add_log(curr_player, f"Unsuccessful attack. Player {curr_player} passes")
     # --- Deal cards to players after round ends ---
     if end_of_round:
         # Get deck from state (if present), else empty
         deck = state.get("deck", [])
-        # Convert deck from string to tuple if needed
-        if deck and isinstance(deck[0], str):
-            deck = [card_str_to_tuple(c) for c in deck]
         # The player who started the attack
         curr_attacker = attacker
         curr_defender = defender
         # Deal to all players in cyclic order, starting from the attacker, skipping the defender.
-        params_list = get_params_list()
+        step_params = get_step_params()
         for i in range(num_of_players):
             player_index: int = (curr_attacker + i) % num_of_players
             if player_index == curr_defender:
                 continue
-            drawn_cards = []
-            for _ in range(min(len(deck), CARDS_PER_HAND - len(hands[player_index]))):
-                drawn_cards.append(deck.pop(0))
+            drawn_cards = draw_cards(deck, CARDS_PER_HAND - len(hands[player_index]))
             hands[player_index].extend(drawn_cards)
             if len(drawn_cards) > 0:
                 inform(
                     bots[player_index],
                     (Input_actions.TO_HAND, drawn_cards.copy()),
-                    params_list[player_index],
+                    step_params[player_index],
                     bot_states[player_index],
+                    clock,
+                    player_index,
                 )
                 add_log(
                     player_index,
-                    f"Player {player_index} drew cards: {card_list_tuples_to_strs(drawn_cards)}",
+                    DEBUG,
+                    "Player {} drew cards: {}",
+                    player_index,
+                    LogCards(drawn_cards),
                 )
         # Deal to defender last
-        drawn_cards = []
-        for _ in range(min(len(deck), CARDS_PER_HAND - len(hands[curr_defender]))):
-            drawn_cards.append(deck.pop(0))
+        drawn_cards = draw_cards(deck, CARDS_PER_HAND - len(hands[curr_defender]))
 
         hands[curr_defender].extend(drawn_cards)
         if len(drawn_cards) > 0:
             inform(
                 bots[curr_defender],
                 (Input_actions.TO_HAND, drawn_cards.copy()),
-                params_list[curr_defender],
+                step_params[curr_defender],
                 bot_states[curr_defender],
+                clock,
+                curr_defender,
             )
             add_log(
                 curr_defender,
-                f"Player {curr_defender} drew cards: {card_list_tuples_to_strs(drawn_cards)}",
+                DEBUG,
+                "Player {} drew cards: {}",
+                curr_defender,
+                LogCards(drawn_cards),
             )
         # Update deck in state
         state["deck"] = deck
@@ -828,18 +1154,13 @@ def advance_game_step(
     # Always update deck_count before returning state
     state["deck_count"] = len(state.get("deck"))
 
-    hands_str = [card_list_tuples_to_strs(h) for h in hands]
-    table_attack_str = [card_tuple_to_str(c) for c in table_attack]
-    table_defence_str = [card_tuple_to_str(c) for c in table_defence]
-
     return {
         **state,
-        "hands": hands_str,
-        "table_attack": table_attack_str if not end_of_round else [],
-        "table_defence": table_defence_str if not end_of_round else [],
+        "hands": hands,
+        "table_attack": table_attack if not end_of_round else [],
+        "table_defence": table_defence if not end_of_round else [],
         "attacker": attacker,
         "defender": defender,
-        "log": log,
         "bot_states": bot_states,
         "curr_player": curr_player,
         "status": status,
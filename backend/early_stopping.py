@@ -0,0 +1,215 @@
+# Early stopping of tournaments.
+# A stopping rule is given the result record of every finished game (see
+# simulation.simulate_game) and tells play_tournament when the bots are told
+# apart well enough to stop before all the games were played:
+#   SPRTStop: Wald's sequential probability ratio tests between every pair of
+#       bots, until each pair has a weaker bot or is found to be even.
+#   ConfidenceStop: until the confidence interval of the loss rate of every
+#       bot is narrow enough.
+# summary() reports the estimates and the confidence reached so far.
+
+import math
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional, Tuple
+
+from tournament_runner import add_to_deal, deal_loss_stats
+
+
+class SPRTStop:
+    """For every pair of bots (a, b), p is the chance that a is the loser of
+    a game that one of them lost. Two tests, with error rates alpha and beta,
+    are run on it: p = 0.5 against p = 0.5 + margin (a is weaker), and
+    p = 0.5 against p = 0.5 - margin (b is weaker). The pair is decided once
+    either finds a weaker bot, or both find the bots even, and its decision
+    is then kept, however the later games go. Games are stopped once every
+    pair is decided."""
+
+    name = "sprt"
+
+    def __init__(
+        self,
+        num_of_bots: int,
+        alpha: float = 0.05,
+        beta: float = 0.05,
+        margin: float = 0.1,
+    ):
+        self.num_of_bots = num_of_bots
+        self.alpha = alpha
+        self.beta = beta
+        self.margin = margin
+        self.games = 0
+        self.loser_count_lst = [0 for _ in range(num_of_bots)]
+        # The log likelihood ratio of "a is weaker" changes by loss_step for
+        # every loss of a, and by other_loss_step (< 0) for every loss of b
+        self.loss_step = math.log((0.5 + margin) / 0.5)
+        self.other_loss_step = math.log((0.5 - margin) / 0.5)
+        self.upper = math.log((1 - beta) / alpha)
+        self.lower = math.log(beta / (1 - alpha))
+        self.pairs = [
+            (a, b) for a in range(num_of_bots) for b in range(a + 1, num_of_bots)
+        ]
+        # The decision of every decided pair, with the log likelihood ratio
+        # that decided it
+        self.decisions: Dict[Tuple[int, int], Tuple[str, float]] = {}
+
+    def add(self, result: Dict[str, Any]) -> None:
+        self.games += 1
+        if result["loser"] == -1:
+            return
+        self.loser_count_lst[result["loser"]] += 1
+        for a, b in self.pairs:
+            if (a, b) not in self.decisions:
+                decision = self.__test(a, b)
+                if decision is not None:
+                    self.decisions[a, b] = (decision, self.__llr(a, b, decision))
+
+    def log_likelihood_ratio(self, a: int, b: int) -> float:
+        """Of "a is weaker" against "a and b are even"."""
+        losses_a = self.loser_count_lst[a]
+        losses_b = self.loser_count_lst[b]
+        return losses_a * self.loss_step + losses_b * self.other_loss_step
+
+    def decision(self, a: int, b: int) -> Optional[str]:
+        """"a" or "b" (the weaker bot), "even", or None if undecided."""
+        decided = self.decisions.get((a, b))
+        return decided[0] if decided else None
+
+    def __test(self, a: int, b: int) -> Optional[str]:
+        """The decision of the tests on the games so far."""
+        llr_a = self.log_likelihood_ratio(a, b)
+        llr_b = self.log_likelihood_ratio(b, a)
+        if llr_a >= self.upper:
+            return "a"
+        if llr_b >= self.upper:
+            return "b"
+        if llr_a <= self.lower and llr_b <= self.lower:
+            return "even"
+        return None
+
+    def __llr(self, a: int, b: int, decision: Optional[str]) -> float:
+        """The log likelihood ratio of the more likely hypothesis (negative
+        for "even")."""
+        llr = max(self.log_likelihood_ratio(a, b), self.log_likelihood_ratio(b, a))
+        return -llr if decision == "even" else llr
+
+    def decided(self) -> bool:
+        return len(self.decisions) == len(self.pairs)
+
+    def summary(self) -> Dict[str, Any]:
+        """The loss rate of every bot, and for every pair the decision so far
+        (the weaker bot, or -1 if they are even) and its confidence: the
+        chance of the more likely hypothesis given the games (up to the
+        decision, for decided pairs), with even odds at the start."""
+        pairs = []
+        for a, b in self.pairs:
+            decision, llr = self.decisions.get((a, b), (None, None))
+            if decision is None:
+                llr = self.__llr(a, b, None)
+            pairs.append(
+                {
+                    "bots": [a, b],
+                    "decided": decision is not None,
+                    "weaker": {"a": a, "b": b}.get(decision, -1),
+                    "confidence": 1 / (1 + math.exp(-abs(llr))),
+                }
+            )
+        return {
+            "rule": self.name,
+            "alpha": self.alpha,
+            "beta": self.beta,
+            "margin": self.margin,
+            "games": self.games,
+            "loss_rates": [
+                count / self.games if self.games else 0.0
+                for count in self.loser_count_lst
+            ],
+            "pairs": pairs,
+            "separated": self.decided(),
+        }
+
+
+class ConfidenceStop:
+    """Stop once the confidence interval (at the given confidence level) of
+    the loss rate of every bot is at most half_width to each side, after at
+    least min_games games. Intervals are Wilson score intervals over the games,
+    or with duplicate, normal intervals over the deals (see deal_loss_stats)."""
+
+    name = "ci"
+
+    def __init__(
+        self,
+        num_of_bots: int,
+        half_width: float = 0.05,
+        confidence: float = 0.95,
+        min_games: int = 20,
+        duplicate: bool = False,
+    ):
+        self.num_of_bots = num_of_bots
+        self.half_width = half_width
+        self.confidence = confidence
+        self.min_games = min_games
+        self.duplicate = duplicate
+        self.z = NormalDist().inv_cdf((1 + confidence) / 2)
+        self.games = 0
+        self.loser_count_lst = [0 for _ in range(num_of_bots)]
+        self.deals: Dict[int, Dict[str, Any]] = {}
+
+    def add(self, result: Dict[str, Any]) -> None:
+        self.games += 1
+        if result["loser"] != -1:
+            self.loser_count_lst[result["loser"]] += 1
+        if self.duplicate:
+            add_to_deal(self.deals, result, self.num_of_bots)
+
+    def intervals(self) -> List[Dict[str, float]]:
+        """The loss rate of every bot and the half width of its interval."""
+        if self.duplicate:
+            stats = deal_loss_stats(list(self.deals.values()), self.num_of_bots)
+            return [
+                {
+                    "loss_rate": bot_stats["loss_rate"],
+                    "half_width": self.z * bot_stats["std_error"],
+                }
+                for bot_stats in stats
+            ]
+        n = self.games
+        z = self.z
+        intervals = []
+        for count in self.loser_count_lst:
+            p = count / n if n else 0.0
+            half_width = (
+                z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+                if n
+                else 1.0
+            )
+            intervals.append({"loss_rate": p, "half_width": half_width})
+        return intervals
+
+    def decided(self) -> bool:
+        if self.games < self.min_games:
+            return False
+        return all(i["half_width"] <= self.half_width for i in self.intervals())
+
+    def summary(self) -> Dict[str, Any]:
+        intervals = self.intervals()
+        return {
+            "rule": self.name,
+            "confidence": self.confidence,
+            "target_half_width": self.half_width,
+            "games": self.games,
+            "loss_rates": [i["loss_rate"] for i in intervals],
+            "half_widths": [i["half_width"] for i in intervals],
+            "separated": self.decided(),
+        }
+
+
+STOP_RULES = {SPRTStop.name: SPRTStop, ConfidenceStop.name: ConfidenceStop}
+
+
+def make_stop_rule(name: str, num_of_bots: int, duplicate: bool = False) -> Any:
+    """A stopping rule by name ("sprt" or "ci"), with the default settings."""
+    if name not in STOP_RULES:
+        raise ValueError(f"Unknown stopping rule: {name}")
+    if name == ConfidenceStop.name:
+        return ConfidenceStop(num_of_bots, duplicate=duplicate)
+    return SPRTStop(num_of_bots)
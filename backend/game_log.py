@@ -0,0 +1,73 @@
+from typing import List, Optional
+
+# Log levels (as in the logging module). Messages below the level of a log
+# are dropped before they are even formatted.
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+
+class GameLog:
+    """Append-only log of a single game, with one list of entries per bot.
+
+    The engine only ever appends to it, so a step costs O(new entries) instead
+    of copying the whole log. Readers page through a bot's log with absolute
+    offsets. If max_entries is given, only (at least) the newest max_entries
+    entries of each bot are kept; older ones are dropped in chunks, and their
+    offsets stay valid for the entries that remain.
+    Only messages of the given level or higher are logged (see
+    is_enabled_for)."""
+
+    def __init__(
+        self, num_of_bots: int, max_entries: Optional[int] = None, level: int = DEBUG
+    ):
+        self.max_entries = max_entries
+        self.level = level
+        self.__entries: List[List[str]] = [[] for _ in range(num_of_bots)]
+        # Number of entries dropped from the start of each bot's log.
+        self.__dropped: List[int] = [0 for _ in range(num_of_bots)]
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def is_enabled_for(self, level: int) -> bool:
+        return level >= self.level
+
+    def append(self, bot_index: int, entry: str) -> None:
+        self.__entries[bot_index].append(entry)
+        self.__trim(bot_index)
+
+    def extend(self, bot_index: int, entries: List[str]) -> None:
+        self.__entries[bot_index].extend(entries)
+        self.__trim(bot_index)
+
+    def __trim(self, bot_index: int) -> None:
+        entries = self.__entries[bot_index]
+        if self.max_entries is None or len(entries) < 2 * self.max_entries:
+            return
+        excess = len(entries) - self.max_entries
+        del entries[:excess]
+        self.__dropped[bot_index] += excess
+
+    def size(self, bot_index: int) -> int:
+        """Total number of entries ever appended to a bot's log."""
+        return self.__dropped[bot_index] + len(self.__entries[bot_index])
+
+    def sizes(self) -> List[int]:
+        return [self.size(i) for i in range(len(self))]
+
+    def read(self, bot_index: int, offset: int = 0, limit: Optional[int] = None):
+        """Entries of a bot's log starting at an absolute offset. Entries that
+        were already dropped are skipped."""
+        start = max(0, offset - self.__dropped[bot_index])
+        end = None if limit is None else start + max(0, limit)
+        return self.__entries[bot_index][start:end]
+
+    def page(self, offset: int = 0, limit: Optional[int] = None) -> List[List[str]]:
+        """The same page (offset, limit) of every bot's log."""
+        return [self.read(i, offset, limit) for i in range(len(self))]
+
+    def last(self, bot_index: int) -> Optional[str]:
+        entries = self.__entries[bot_index]
+        return entries[-1] if entries else None
@@ -1,5 +1,7 @@
+from functools import lru_cache
 from itertools import combinations
-from abstract_bot import AbstractBot
+from abstract_bot import AbstractBot, DEBUG
+from card_tracker import CardTracker
 from typing import Any, List, Tuple, Dict
 
 from configurations import CARDS_PER_HAND
@@ -7,6 +9,15 @@ from configurations import CARDS_PER_HAND
 Card = tuple[int, int]
 
 
+@lru_cache(maxsize=1024)
+def cached_non_empty_subsets(items: tuple) -> tuple:
+    """All the non-empty subsets of items as tuples, in combinations order.
+    The same small groups of cards come up in almost every decision."""
+    return tuple(
+        subset for r in range(1, len(items) + 1) for subset in combinations(items, r)
+    )
+
+
 class ExampleBot(AbstractBot):
     """A bot that plays a trivial strategy."""
 
@@ -34,8 +45,11 @@ class ExampleBot(AbstractBot):
             (i, suit) for suit in ordered_suits for i in range(13)
         ]
 
-        # All the cards that were burned
-        self.burned_cards: list[Card] = []
+        # Counts of the burned, unseen and known cards, for quick queries.
+        # It is not told about the cards we draw, like possible_cards.
+        self.card_tracker = CardTracker(
+            num_of_players, my_index, hand, self.get_kozar_suit()
+        )
         # Mapping player indexes to the cards we know they have.
         self.player_cards: list[list[Card]] = [[] for _ in range(num_of_players)]
         self.player_cards[my_index] = self.sort_cards(hand)
@@ -45,6 +59,17 @@ class ExampleBot(AbstractBot):
         for item in hand:
             self.possible_cards.discard(item)
 
+    def snapshot_state(self) -> Dict[str, Any]:
+        state = super().snapshot_state()
+        if isinstance(state.get("card_tracker"), CardTracker):
+            state["card_tracker"] = state["card_tracker"].to_dict()
+        return state
+
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        super().restore_state(state)
+        if isinstance(self.__dict__.get("card_tracker"), dict):
+            self.card_tracker = CardTracker.from_dict(self.card_tracker)
+
     def strength(self, card: Card) -> float:
         lerp = self.get_deck_count() / self.initial_deck_size
         kozar_bonus = (
@@ -53,32 +78,80 @@ class ExampleBot(AbstractBot):
         )
         return card[0] + (kozar_bonus if card[1] == self.get_kozar_suit() else 0.0)
 
+    def strength_table(self) -> list[float]:
+        """The strength of every card, at index suit * 13 + rank.
+        Strengths only change with the deck count, so the table is only built
+        again when the deck count changed."""
+        cache = getattr(self, "strength_cache", None)
+        if cache is None or cache[0] != self.get_deck_count():
+            table = [
+                self.strength((rank, suit)) for suit in range(4) for rank in range(13)
+            ]
+            cache = [self.get_deck_count(), table]
+            self.strength_cache = cache
+        return cache[1]
+
     def get_average_strength(self) -> float:
-        return sum(self.strength(card) for card in self.possible_cards) / len(
+        table = self.strength_table()
+        return sum(table[suit * 13 + rank] for rank, suit in self.possible_cards) / len(
             self.possible_cards if self.possible_cards else 0
         )
 
-    def evaluate(self, hand: list[Card]) -> float:
-        if not hand and self.empty_deck():
-            return 1000.0
+    def average_strength(self) -> float:
+        """get_average_strength(), computed once per call of the bot (the
+        possible cards only change between calls, and get_hand() is a new
+        list on every call)."""
+        cache = getattr(self, "average_strength_cache", None)
+        if cache is None or cache[0] is not self.get_hand():
+            cache = [self.get_hand(), self.get_average_strength()]
+            self.average_strength_cache = cache
+        return cache[1]
 
-        drawn_cards = (
-            len(hand) if self.empty_deck() else max(0, CARDS_PER_HAND - len(hand))
-        )
-        score: float = (
-            sum(self.strength(card) for card in hand)
-            + self.get_average_strength() * drawn_cards
-        ) / (float(len(hand) + drawn_cards) ** ExampleBot.HAND_SIZE_POWER)
-        score += (
-            max(0, len(hand) + drawn_cards - CARDS_PER_HAND) * ExampleBot.OVER_MAX_SCORE
-        )
-        return score
+    def evaluate(self, hand: list[Card]) -> float:
+        return self.evaluate_many([hand])[0]
+
+    def evaluate_many(self, hands: list[list[Card]]) -> list[float]:
+        """The scores of many candidate hands, in one pass over the strength
+        table."""
+        table = self.strength_table()
+        empty_deck = self.empty_deck()
+        average = None
+        scores: list[float] = []
+        for hand in hands:
+            if not hand and empty_deck:
+                scores.append(1000.0)
+                continue
+            if average is None:
+                average = self.average_strength()
+            size = len(hand)
+            drawn_cards = size if empty_deck else max(0, CARDS_PER_HAND - size)
+            score: float = (
+                sum(table[suit * 13 + rank] for rank, suit in hand)
+                + average * drawn_cards
+            ) / (float(size + drawn_cards) ** ExampleBot.HAND_SIZE_POWER)
+            score += (
+                max(0, size + drawn_cards - CARDS_PER_HAND) * ExampleBot.OVER_MAX_SCORE
+            )
+            scores.append(score)
+        return scores
 
     def evaluate_attack(self, hand: list[Card]) -> float:
-        score: float = self.evaluate(hand)
-        return score + self.check_forward_circle(
-            hand[0], len([card for card in self.get_hand() if card[0] == hand[0][0]])
-        )
+        return self.evaluate_attacks([hand])[0]
+
+    def evaluate_attacks(self, hands: list[list[Card]]) -> list[float]:
+        """evaluate_attack() of many candidate hands."""
+        rank_counts = [0] * 13
+        for card in self.get_hand():
+            rank_counts[card[0]] += 1
+        # check_forward_circle only depends on the rank, so many hands share it
+        circles: dict[int, float] = {}
+        scores = self.evaluate_many(hands)
+        for i, hand in enumerate(hands):
+            rank = hand[0][0]
+            if rank not in circles:
+                circles[rank] = self.check_forward_circle(hand[0], rank_counts[rank])
+            scores[i] += circles[rank]
+        return scores
 
     def empty_deck(self):
         return self.get_deck_count() == 0
@@ -100,19 +173,16 @@ class ExampleBot(AbstractBot):
 
     def pick_opt_attack(self, options: List[Card], log: bool, our_hand: List[Card]):
         options.append([])
-        best_option: List[Card] = max(
-            options,
-            key=lambda x: self.evaluate(list(set(our_hand) - set(x))),
-            default=[],
+        our_hand_set = set(our_hand)
+        scores = self.evaluate_many(
+            [list(our_hand_set - set(option)) for option in options]
         )
-        scores = [
-            self.evaluate(list(set(our_hand) - set(option))) for option in options
-        ]
+        best_option: List[Card] = options[scores.index(max(scores))]
         if log:
-            self.log(f"Options: {options}, scores: {scores}")
+            self.log("Options: {}, scores: {}", options, scores, level=DEBUG)
         if best_option:
             if log:
-                self.log(f"Joining attack with: {best_option}")
+                self.log("Joining attack with: {}", best_option)
             return list(best_option)
         if log:
             self.log("Passing on joining attack.")
@@ -143,7 +213,7 @@ class ExampleBot(AbstractBot):
     def sort_cards(self, cardlist: List[Card]) -> List[Card]:
         nonkozars, kozars = self.separate_kozars(cardlist)
         sorted_cards = sorted(nonkozars) + sorted(kozars)
-        self.log(str(sorted_cards))
+        self.log("{}", sorted_cards, level=DEBUG)
         return sorted_cards
 
     def group_by_num(self, cardlist: List[Card]) -> List[List[Card]]:
@@ -171,17 +241,13 @@ class ExampleBot(AbstractBot):
         options: List[Card] = sum(
             [self.non_empty_subsets(g) for g in self.group_by_num(self.get_hand())], []
         )
-        best_option: List[Card] = max(
-            options,
-            key=lambda x: self.evaluate_attack(list(set(self.get_hand()) - set(x))),
-            default=[],
+        hand_set = set(self.get_hand())
+        scores = self.evaluate_attacks(
+            [list(hand_set - set(option)) for option in options]
         )
-        scores = [
-            self.evaluate_attack(list(set(self.get_hand()) - set(option)))
-            for option in options
-        ]
-        self.log(f"Options: {options}, scores: {scores}")
-        self.log(f"Attacking with: {best_option}")
+        best_option: List[Card] = options[scores.index(max(scores))] if options else []
+        self.log("Options: {}, scores: {}", options, scores, level=DEBUG)
+        self.log("Attacking with: {}", best_option)
         return list(best_option)
 
     def check_forward_circle(self, card: Card, num_cards: int) -> float:
@@ -191,44 +257,27 @@ class ExampleBot(AbstractBot):
         Choose option with highest score
         """
         card_num = card[0]
-        cards_in_game = (
-            4
-            - num_cards
-            - len([burned for burned in self.burned_cards if burned[0] == card_num])
-        )
-        cards_in_deck = (
-            len([unknown for unknown in self.possible_cards if unknown[0] == card_num])
-            - num_cards
-        )
+        tracker = self.card_tracker
+        cards_in_game = 4 - num_cards - tracker.burned_of_rank(card_num)
+        cards_in_deck = tracker.unseen_of_rank(card_num) - num_cards
         if cards_in_game < self.num_players - 1:
             return 1
         chances = 1
         for index in range(1, self.num_players):
             cur_player = (self.my_index + index) % self.num_players
-            if (
-                len(
-                    list(
-                        [
-                            card
-                            for card in self.player_cards[cur_player]
-                            if card[0] == card_num
-                        ]
-                    )
-                )
-                > 0
-            ):
+            if tracker.known_of_rank(cur_player, card_num) > 0:
                 continue
             unknown_cards = self.unknown_cards_in_hand(cur_player)
             if unknown_cards == 0:
                 return 1
             chances *= (
-                1 - (1 - unknown_cards / len(self.possible_cards)) ** cards_in_deck
+                1 - (1 - unknown_cards / tracker.unseen_count) ** cards_in_deck
             )
         return 1 - chances
 
     def unknown_cards_in_hand(self, player_ind: int) -> int:
-        return self.get_num_cards_per_hand()[player_ind] - len(
-            self.player_cards[player_ind]
+        return self.card_tracker.unknown_cards_in_hand(
+            player_ind, self.get_num_cards_per_hand()[player_ind]
         )
 
     def possible_forward(self) -> list[Card]:
@@ -244,10 +293,7 @@ class ExampleBot(AbstractBot):
         return attacking_cards
 
     def non_empty_subsets(self, l: list[Any]) -> list[list[Any]]:
-        result: list[list[Any]] = []
-        for r in range(1, len(l) + 1):
-            result.extend(list(combinations(l, r)))
-        return result
+        return list(cached_non_empty_subsets(tuple(l)))
 
     def all_possible_forwards(self) -> list[list[Card]]:
         num = [card for card in self.get_table_attack() if card is not None][0][0]
@@ -261,7 +307,7 @@ class ExampleBot(AbstractBot):
         # if possible to forward
         forward_lists = self.all_possible_forwards()
         defence_list = self.defend_with_cards(self.get_hand())
-        self.log(f"All possible forwards: {forward_lists}")
+        self.log("All possible forwards: {}", forward_lists)
 
         """best_forward = max(
             forward_lists,
@@ -281,30 +327,30 @@ class ExampleBot(AbstractBot):
             if best_forward
             else -1000.0
         )
-        self.log(f"Best forward: {best_forward}; score: {forward_score}")
+        self.log("Best forward: {}; score: {}", best_forward, forward_score)
 
         defence_score = (
             self.evaluate(list(set(self.get_hand()) - set(defence_list[0])))
             if defence_list[0]
             else -1000.0
         )
-        self.log(f"Defence: {defence_list}; score: {defence_score}")
+        self.log("Defence: {}; score: {}", defence_list, defence_score)
 
         attacking_cards = list(
             filter(lambda card: card is not None, self.get_table_attack())
         )
         take_score = self.evaluate(self.get_hand() + attacking_cards)
-        self.log(f"Take score: {take_score}")
+        self.log("Take score: {}", take_score)
 
         max_score = max([take_score, defence_score, forward_score])
         if max_score == take_score:
-            self.log(f"Taking")
+            self.log("Taking")
             return [], []
         if max_score == defence_score:
-            self.log(f"Defending")
+            self.log("Defending")
             return defence_list
         if max_score == forward_score:
-            self.log(f"Forwarding")
+            self.log("Forwarding")
             return list(best_forward), []
 
     def enemy_optional_attack(
@@ -337,19 +383,22 @@ class ExampleBot(AbstractBot):
     ):
         defending_cards: list[Card] = []
         indexes: list[int] = []
+        # Sorted once; a card leaves it whenever it leaves the hand
+        sorted_hand = self.sort_cards(hand)
         for index, attacking_card in enumerate(table_attack):
             if attacking_card is None:
                 continue
             if current_defence[index]:  # already defended this one
                 continue
             flag: bool = False
-            for card in self.sort_cards(hand):
+            for card in sorted_hand:
                 if (
                     card[0] > attacking_card[0] and card[1] == attacking_card[1]
                 ) or card[1] == self.get_kozar_suit():
                     defending_cards.append(card)
                     indexes.append(index)
                     hand.remove(card)
+                    sorted_hand.remove(card)
                     flag = True
                     break
             # failed to defend
@@ -359,12 +408,13 @@ class ExampleBot(AbstractBot):
                     defending_cards.append(kozars[0])
                     indexes.append(index)
                     hand.remove(kozars[0])
+                    sorted_hand.remove(kozars[0])
                 else:
                     if log:
                         self.log("Taking cards.")
                     return [], []
         if log:
-            self.log(f"Defending with {defending_cards}, {indexes}")
+            self.log("Defending with {}, {}", defending_cards, indexes)
         return defending_cards, indexes
 
     def defend_with_cards(
@@ -398,28 +448,30 @@ class ExampleBot(AbstractBot):
         )
 
     def notify_burn(self, card_list: list[Card]):
-        self.log(f"burn: {card_list}")
-        self.burned_cards.extend(card_list)
+        self.log("burn: {}", card_list)
+        self.card_tracker.notify_burn(card_list)
 
     def notify_cards_drawn_to_hand(self, card_list: list[Card]):
-        self.log(f"cards drawn to hand: {card_list}")
+        self.log("cards drawn to hand: {}", card_list)
 
     def notify_winner(self, winner_index: int):
-        self.log(f"Winner: {winner_index}")
+        self.log("Winner: {}", winner_index)
 
     def notify_pass(self, passer_index: int):
-        self.log(f"Player {passer_index} passed")
+        self.log("Player {} passed", passer_index)
 
     def notify_optional_attack(self, attacker_index: int, card_list: list[Card]):
+        self.card_tracker.notify_optional_attack(attacker_index, card_list)
         for card in card_list:
             self.possible_cards.discard(card)
             try:
                 self.player_cards[attacker_index].remove(card)
             except ValueError:
                 pass
-        self.log(f"Player {attacker_index} optional attack with cards: {card_list}")
+        self.log("Player {} optional attack with cards: {}", attacker_index, card_list)
 
     def notify_first_attack(self, attacker_index: int, card_list: list[Card]):
+        self.card_tracker.notify_first_attack(attacker_index, card_list)
         for card in card_list:
             self.possible_cards.discard(card)
             try:
@@ -427,7 +479,7 @@ class ExampleBot(AbstractBot):
             except ValueError:
                 pass
 
-        self.log(f"Player {attacker_index} first attack with cards: {card_list}")
+        self.log("Player {} first attack with cards: {}", attacker_index, card_list)
 
     def notify_defence(
         self,
@@ -435,6 +487,7 @@ class ExampleBot(AbstractBot):
         defending_cards: list[Card],
         indexes: list[int],
     ):
+        self.card_tracker.notify_defence(defender_index, defending_cards, indexes)
         for card in defending_cards:
             self.possible_cards.discard(card)
             try:
@@ -442,21 +495,26 @@ class ExampleBot(AbstractBot):
             except ValueError:
                 pass
         self.log(
-            f"Player {defender_index} defended with cards: {defending_cards} at indexes: {indexes}"
+            "Player {} defended with cards: {} at indexes: {}",
+            defender_index,
+            defending_cards,
+            indexes,
         )
 
     def notify_forward(self, forwarder_index: int, card_list: list[Card]):
+        self.card_tracker.notify_forward(forwarder_index, card_list)
         for card in card_list:
             self.possible_cards.discard(card)
             try:
                 self.player_cards[forwarder_index].remove(card)
             except ValueError:
                 pass
-        self.log(f"Player {forwarder_index} forwarded with cards: {card_list}")
+        self.log("Player {} forwarded with cards: {}", forwarder_index, card_list)
 
     def notify_take(self, defender_index: int, card_list: list[Card]):
+        self.card_tracker.notify_take(defender_index, card_list)
         self.player_cards[defender_index].extend(card_list)
-        self.log(f"Player {defender_index} took cards: {card_list}")
+        self.log("Player {} took cards: {}", defender_index, card_list)
 
 
 bot: ExampleBot = ExampleBot()
@@ -0,0 +1,101 @@
+# Legal moves, shared by the engine (legal_actions in durak_game) and the bots
+# (the get_legal_* methods of AbstractBot).
+# Every function lists the single cards a player may play on the table, as the
+# engine checks them in attack_with_card_list, defend_with_card_list and
+# forward_with_card_list. A move of several cards is legal if its cards can be
+# played one after the other. Defences are looked up in the beat tables of
+# card_masks, so the hand is never compared card by card.
+
+from itertools import chain
+from typing import List, Optional, Sequence, Tuple
+
+from card_masks import BEATS, NUM_OF_RANKS, cards_from_mask, mask_from_cards
+
+Card = Tuple[int, int]
+
+
+def next_player_index(
+    cards_per_hand: Sequence[int], index: int, deck_count: int
+) -> int:
+    """The player after index, skipping players without cards once the deck
+    is empty (like get_next_player in advance_game_step)."""
+    num_of_players = len(cards_per_hand)
+    if deck_count:
+        return (index + 1) % num_of_players
+    for offset in range(1, num_of_players + 1):
+        next_index = (index + offset) % num_of_players
+        if cards_per_hand[next_index] > 0:
+            return next_index
+    return index
+
+
+def legal_attacks(
+    hand: List[Card],
+    table_attack: Sequence[Optional[Card]],
+    table_defence: Sequence[Optional[Card]],
+) -> List[Card]:
+    """The cards of the hand that may start the attack (on an empty table) or
+    join it. Empty if there is no free attack slot."""
+    if None not in table_attack:
+        return []
+    ranks = 0
+    for card in chain(table_attack, table_defence):
+        if card is not None:
+            ranks |= 1 << card[0]
+    if not ranks:
+        return list(hand)
+    return [card for card in hand if ranks >> card[0] & 1]
+
+
+def legal_defences(
+    hand: List[Card],
+    table_attack: Sequence[Optional[Card]],
+    table_defence: Sequence[Optional[Card]],
+    kozar_suit: int,
+) -> List[Tuple[Card, int]]:
+    """(card, index) for every card of the hand and every undefended attacking
+    card (by its index on the table) that the card beats."""
+    hand_mask = mask_from_cards(hand)
+    beats = BEATS[kozar_suit]
+    defences = []
+    for index, (attacking_card, defending_card) in enumerate(
+        zip(table_attack, table_defence)
+    ):
+        if attacking_card is None or defending_card is not None:
+            continue
+        bit_index = attacking_card[1] * NUM_OF_RANKS + attacking_card[0]
+        beating = cards_from_mask(hand_mask & beats[bit_index])
+        defences.extend((card, index) for card in beating)
+    return defences
+
+
+def forwarding_allowance(
+    cards_per_hand: Sequence[int],
+    table_attack: Sequence[Optional[Card]],
+    defender: int,
+    deck_count: int,
+) -> int:
+    """How many cards the defender may forward with: the attack may not get
+    larger than the hand of the player it is forwarded to."""
+    next_defender = next_player_index(cards_per_hand, defender, deck_count)
+    num_of_attacks = sum(1 for card in table_attack if card is not None)
+    return cards_per_hand[next_defender] - num_of_attacks
+
+
+def legal_forwards(
+    hand: List[Card],
+    table_attack: Sequence[Optional[Card]],
+    table_defence: Sequence[Optional[Card]],
+    num_of_allowed_forwarding_cards: int,
+) -> List[Card]:
+    """The cards of the hand that may forward the attack. Empty if it cannot
+    be forwarded (a card was already defended, or the allowance is used up)."""
+    if (
+        num_of_allowed_forwarding_cards <= 0
+        or not table_attack
+        or table_attack[0] is None
+        or any(card is not None for card in table_defence)
+    ):
+        return []
+    rank = table_attack[0][0]
+    return [card for card in hand if card[0] == rank]
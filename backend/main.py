@@ -6,10 +6,13 @@
 
 import os
 import uuid
-import importlib.util, importlib.machinery
 import sys
-import io
 import traceback
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
 
 # Add this before importing durak_game
 backend_dir = os.path.dirname(os.path.abspath(__file__))
@@ -17,19 +20,44 @@ if backend_dir not in sys.path:
     sys.path.insert(0, backend_dir)
 
 from fastapi import FastAPI, UploadFile, Form, Request
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import status as fastapi_status
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel
 import random
 from configurations import (
     SUITS,
-    RANKS,
-    CARDS_PER_HAND,
-    USE_FIXED_DECK,
+    FIXED_GAME_SEED,
+    GAME_IDLE_TIMEOUT,
+    MAX_CONCURRENT_TOURNAMENTS,
+    MAX_NUM_OF_STEPS,
+    SANDBOX_BOTS,
+    TIME_BANK_PER_GAME,
 )
-from durak_game import pretty_print_state, card_str_to_tuple, advance_game_step
+from durak_game import (
+    pretty_print_state,
+    card_tuple_to_str,
+    card_list_tuples_to_strs,
+    render_state,
+    advance_game_step,
+    create_deck,
+    new_game_state,
+    in_place_bot_states,
+    snapshot_bot_states,
+    set_bots_log_level,
+)
+from game_log import GameLog
+from bot_clock import BotClock, merge_timing
+from bot_loader import load_bot_cached, invalidate_bot, fresh_bot_instance
+from bot_sandbox import (
+    acquire_sandboxed_bot,
+    release_sandboxed_bot,
+    close_sandboxed_bots,
+)
+from tournament_runner import play_tournament, add_to_deal, deal_loss_stats
+from early_stopping import STOP_RULES, make_stop_rule
+from simulation import game_is_over
 
 app = FastAPI()
 app.add_middleware(
@@ -42,6 +70,13 @@ app.add_middleware(
 # Set BOTS_DIR to the absolute path of the backend/bots directory
 BOTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bots")
 GAMES = {}
+TOURNAMENTS = {}
+# Tournament jobs run on their own threads, so that they never hold up the
+# default executor, which plays the batched steps of games. Every job already
+# uses all the cores, so only MAX_CONCURRENT_TOURNAMENTS run at once.
+TOURNAMENT_EXECUTOR = ThreadPoolExecutor(
+    MAX_CONCURRENT_TOURNAMENTS, thread_name_prefix="tournament"
+)
 
 os.makedirs(BOTS_DIR, exist_ok=True)
 
@@ -55,56 +90,10 @@ class GameState(BaseModel):
     id: str
     bots: List[str]
     state: dict
-
-
-def create_deck():
-    deck = [{"rank": r, "suit": s} for s in SUITS for r in RANKS]
-    random.shuffle(deck)
-    return deck
-
-
-def shuffle(deck):
-    random.shuffle(deck)
-    return deck
-
-
-def deal_players(deck, num_players):
-    hands = [[] for _ in range(num_players)]
-    for i in range(CARDS_PER_HAND):
-        for j in range(num_players):
-            if deck:
-                hands[j].append(deck.pop(0))
-    return hands
-
-
-def load_bot(filepath):
-    # Ensure backend dir is in sys.path for bot imports
-    backend_dir = os.path.dirname(os.path.abspath(__file__))
-    if backend_dir not in sys.path:
-        sys.path.insert(0, backend_dir)
-    if not os.path.exists(filepath):
-        raise FileNotFoundError(f"Bot file not found: {filepath}")
-    module_name = os.path.splitext(os.path.basename(filepath))[0]
-    if filepath.endswith(".py"):
-        spec = importlib.util.spec_from_file_location(module_name, filepath)
-    elif filepath.endswith(".pyc"):
-        loader = importlib.machinery.SourcelessFileLoader(module_name, filepath)
-        spec = importlib.util.spec_from_loader(module_name, loader)
-    else:
-        raise ImportError(f"Unsupported file type for bot file: {filepath}")
-    if spec is None or spec.loader is None:
-        raise ImportError(f"Could not load spec for bot file: {filepath}")
-    try:
-        module = importlib.util.module_from_spec(spec)
-        sys.modules[module_name] = module
-        spec.loader.exec_module(module)
-        # Try to get 'bot' instance, else fallback to module
-        bot_instance = getattr(module, "bot", module)
-        return bot_instance
-    except Exception as e:
-        print(f"[ERROR] Failed to load bot from {filepath}: {e}")
-        traceback.print_exc()
-        return None
+    # Set by the step endpoint: how many steps were played, and (if asked
+    # for) the condensed changes of each of them.
+    steps: Optional[int] = None
+    events: Optional[List[dict]] = None
 
 
 @app.get("/api/bots", response_model=List[BotInfo])
@@ -140,6 +129,8 @@ async def upload_bot(file: UploadFile, name: str = Form(...)):
         )
         with open(filepath, "wb") as f:
             f.write(file_content)
+        invalidate_bot(filepath)
+        close_sandboxed_bots(filepath)
         # Save the display name in a .name file
         name_file = os.path.splitext(filepath)[0] + ".name"
         with open(name_file, "w", encoding="utf-8") as f:
@@ -171,6 +162,8 @@ def delete_bot(filename: str):
     try:
         if os.path.exists(filepath):
             os.remove(filepath)
+        invalidate_bot(filepath)
+        close_sandboxed_bots(filepath)
         if os.path.exists(name_file):
             os.remove(name_file)
         return {"success": True}
@@ -180,69 +173,199 @@ def delete_bot(filename: str):
         )
 
 
-def create_game_state(num_bots):
-    deck = shuffle(create_deck())
-    if USE_FIXED_DECK:
-        try:
-            with open("deck.txt","r") as f:
-                deck_str = f.read()
-                deck = [tuple([int(x) for x in s.split(",")]) for s in deck_str.split()]
-                deck = [{"rank": RANKS[c[0]], "suit": SUITS[c[1]]} for c in deck]
-        except Exception as e:
-            pass
-
-    with open("deck.txt", "w") as file:
-        for c in deck:
-            r, s = card_str_to_tuple(f"{c['rank']}{c['suit']}")
-            file.write(f"{r},{s} ")
-    trump_card_obj = deck[-1]
-    trump_card = f"{trump_card_obj['rank']}{trump_card_obj['suit']}"
-    trump_suit = trump_card_obj["suit"]
-    hands = deal_players(deck, num_bots)
-    # Find attacker: player with the lowest trump card (lowest rank of trump suit)
-    lowest_trump = 20
-    attacker = random.randint(0, num_bots - 1)
-    trump_rank_order = RANKS
-    for i, hand in enumerate(hands):
-        trump_cards = [
-            trump_rank_order.index(c["rank"]) for c in hand if c["suit"] == trump_suit
+def create_game_state(num_bots, seed=None):
+    """A new game state and the rng of the game. A game is fully defined by
+    its seed (FIXED_GAME_SEED or a random one, if not given), which is kept
+    in the state: the rng shuffles the deck and makes the engine's random
+    decisions, like in simulation.simulate_game, so a game can be replayed
+    from its seed."""
+    if seed is None:
+        seed = FIXED_GAME_SEED
+    if seed is None:
+        seed = random.randrange(2**32)
+    rng = random.Random(seed)
+    state = new_game_state(create_deck(rng), num_bots, rng)
+    state["seed"] = seed
+    return state, rng
+
+
+def new_game(bot_filenames, bot_names, bots, state, rng):
+    game = {
+        "bots": bot_filenames,
+        "bot_names": bot_names,
+        "state": state,
+        "rng": rng,
+        "log": GameLog(len(bot_filenames)),
+        "clock": BotClock(len(bot_filenames), TIME_BANK_PER_GAME),
+        "bot_instances": bots,
+        # Held while the game is stepped or its state is read (see
+        # run_with_game_lock)
+        "lock": threading.Lock(),
+        # When the game was last stepped or read (see evict_idle_games)
+        "last_used": monotonic(),
+        # Every step bumps the version of the game. field_versions maps each
+        # field of the rendered state to the version it was last seen changed
+        # in, and log_sizes[v] holds the log size of every bot at version v.
+        "version": 0,
+        "field_versions": {},
+        "log_sizes": [],
+        "snapshot": {},
+    }
+    track_game_version(game, 0)
+    return game
+
+
+def track_game_version(game, version):
+    """Set the version of a game after its state changed. Only the log sizes
+    are recorded here: the changed fields are found when a client asks for
+    the state (see update_field_versions), so steps never render the state."""
+    game["version"] = version
+    game["log_sizes"].append(game["log"].sizes())
+
+
+def update_field_versions(game, rendered):
+    """Record which fields of a game's rendered state changed since it was
+    last rendered for a client. They are marked as changed at the current
+    version, so a client asking for the changes since an older version gets
+    every field that changed after it (and maybe some that changed before)."""
+    version = game["version"]
+    # bot_states are updated in place, so they are assumed to always change
+    game["field_versions"]["bot_states"] = version
+    for key, value in rendered.items():
+        if key != "bot_states" and game["snapshot"].get(key) != value:
+            game["field_versions"][key] = version
+    # Copy the lists the engine may update in place (like status)
+    game["snapshot"] = {
+        key: list(value) if isinstance(value, list) else value
+        for key, value in rendered.items()
+        if key != "bot_states"
+    }
+
+
+def evict_idle_games():
+    """Drop the games that were not stepped or read for GAME_IDLE_TIMEOUT
+    seconds, returning the workers of their sandboxed bots to the pool."""
+    oldest = monotonic() - GAME_IDLE_TIMEOUT
+    for game_id, game in list(GAMES.items()):
+        if game["last_used"] < oldest and game["lock"].acquire(blocking=False):
+            try:
+                GAMES.pop(game_id, None)
+                release_game_bots(game)
+            finally:
+                game["lock"].release()
+
+
+async def run_with_game_lock(game, func):
+    """Call func on a worker thread holding the lock of a game, so that steps
+    (and reads of the state) from different requests on the same game never
+    interleave, and a slow bot never blocks the event loop."""
+    game["last_used"] = monotonic()
+    lock = game["lock"]
+
+    def locked():
+        with lock:
+            return func()
+
+    return await asyncio.to_thread(locked)
+
+
+def advance_game(game):
+    """Play one step of a stored game."""
+    game["state"] = advance_game_step(
+        game["state"],
+        game["bot_instances"],
+        game.get("bot_names", []),
+        game["log"],
+        rng=game["rng"],
+        clock=game["clock"],
+    )
+    track_game_version(game, game["version"] + 1)
+    if game_is_over(game["state"]):
+        release_game_bots(game)
+
+
+def release_game_bots(game):
+    """Return the workers of a finished game's sandboxed bots to the pool,
+    keeping the bots' final states for the UI."""
+    bots = game["bot_instances"]
+    if not any(getattr(bot, "sandboxed", False) for bot in bots):
+        return
+    state = game["state"]
+    state["bot_states"] = snapshot_bot_states(state["bot_states"], bots)
+    for bot in bots:
+        if getattr(bot, "sandboxed", False):
+            release_sandboxed_bot(bot)
+    game["bot_instances"] = [None for _ in bots]
+
+
+def game_state_for_ui(
+    game: dict,
+    log_offset: int = 0,
+    log_limit: Optional[int] = None,
+    since: Optional[int] = None,
+    exclude: Optional[str] = None,
+) -> dict:
+    """The rendered state of a game, with a page of each bot's log.
+    'log_sizes' holds the total length of each bot's log, for paging.
+    If since (a version) is given, only the fields that changed after that
+    version are included, and the log holds only the entries added after it.
+    exclude is a comma separated list of fields to leave out (like bot_states)."""
+    state = render_state(game["state"])
+    update_field_versions(game, state)
+    if since is None:
+        log = game["log"].page(log_offset, log_limit)
+    else:
+        since = min(max(since, 0), game["version"])
+        state = {
+            key: value
+            for key, value in state.items()
+            if game["field_versions"].get(key, 0) > since
+        }
+        log = [
+            game["log"].read(i, size, log_limit)
+            for i, size in enumerate(game["log_sizes"][since])
         ]
-        if trump_cards:
-            min_trump = min(trump_cards)
-            if min_trump < lowest_trump:
-                lowest_trump = min_trump
-                attacker = i
-    if lowest_trump > len(trump_rank_order):
-        lowest_trump = -1
-    defender = (attacker + 1) % num_bots
+    for key in (exclude or "").split(","):
+        state.pop(key.strip(), None)
+    if "bot_states" in state:
+        state["bot_states"] = snapshot_bot_states(
+            state["bot_states"], game["bot_instances"]
+        )
     return {
-        "trump_suit": trump_suit,
-        "trump_card": trump_card,  # always a string like '7♠'
-        "lowest_trump": lowest_trump,  # if there is no trump, it is marked as -1.
-        "hands": [[f"{c['rank']}{c['suit']}" for c in h] for h in hands],
-        "table_attack": [],
-        "table_defence": [],
-        "attacker": attacker,
-        "defender": defender,
-        "curr_player": attacker,
-        "log": [[] for _ in range(num_bots)],  # log is now a list of lists, one per bot
-        "bot_states": [{} for _ in range(num_bots)],
-        "burn": False,
-        "num_of_burned_cards": 0,
-        "deck": [f"{c['rank']}{c['suit']}" for c in deck],
-        "deck_count": len(deck),  # Add deck count to state
+        **state,
+        "log": log,
+        "log_offset": log_offset,
+        "log_sizes": game["log"].sizes(),
+        "version": game["version"],
+        "since": since,
     }
 
 
 @app.post("/api/games", response_model=GameState)
 async def create_game(request: Request):
-    bot_filenames = await request.json()
+    """Start a game. The body is the list of bot filenames, or an object with
+    the "bots" and the "seed" of the game (to replay a game)."""
+    data = await request.json()
+    if isinstance(data, dict):
+        bot_filenames = data.get("bots", [])
+        seed = data.get("seed")
+        seed = int(seed) if seed is not None else None
+    else:
+        bot_filenames = data
+        seed = None
+    # Abandoned games would keep their bots' workers forever
+    evict_idle_games()
     bots = []
     bot_names = []
     for fname in bot_filenames:
         bot_path = os.path.join(BOTS_DIR, fname)
-        bot_instance = load_bot(bot_path)
-        bots.append(bot_instance)
+        # Every game plays with its own instances, kept for the whole game
+        if SANDBOX_BOTS:
+            bot_instance = await asyncio.to_thread(acquire_sandboxed_bot, bot_path)
+            bots.append(bot_instance)
+        else:
+            bot_instance = load_bot_cached(bot_path)
+            bots.append(fresh_bot_instance(bot_instance))
         # Use bot.name if available, else fallback to .name file, else fallback to filename
         bot_name = getattr(bot_instance, "name", None)
         if not bot_name:
@@ -253,45 +376,191 @@ async def create_game(request: Request):
         if not bot_name:
             bot_name = fname.split("_", 1)[-1].replace(".pyc", "").replace(".py", "")
         bot_names.append(bot_name)
-    state = create_game_state(len(bot_filenames))
+    state, rng = create_game_state(len(bot_filenames), seed)
+    # The bots live for the whole game, so their state is kept on them
+    state["bot_states"] = in_place_bot_states(bots)
     # Pretty print the initial state for debugging
     pretty_print_state(state)
     game_id = uuid.uuid4().hex
-    GAMES[game_id] = {"bots": bot_filenames, "bot_names": bot_names, "state": state}
-    return GameState(id=game_id, bots=bot_names, state=state)
+    GAMES[game_id] = new_game(bot_filenames, bot_names, bots, state, rng)
+    return GameState(
+        id=game_id, bots=bot_names, state=game_state_for_ui(GAMES[game_id])
+    )
 
 
 @app.get("/api/games/{game_id}", response_model=GameState)
-def get_game(game_id: str):
+def get_game(
+    game_id: str,
+    log_offset: int = 0,
+    log_limit: Optional[int] = None,
+    since: Optional[int] = None,
+    exclude: Optional[str] = None,
+):
     game = GAMES.get(game_id)
     if not game:
         return {"error": "Game not found"}
-    return GameState(id=game_id, bots=game["bots"], state=game["state"])
+    game["last_used"] = monotonic()
+    with game["lock"]:
+        state = game_state_for_ui(game, log_offset, log_limit, since, exclude)
+    return GameState(id=game_id, bots=game["bots"], state=state)
+
+
+STEP_UNTIL_MODES = ["round_end", "game_end"]
+
+
+def advance_game_steps(game, n=1, until=None, with_events=False):
+    """Play up to n steps of a stored game, or (if until is given) until the
+    current round or the whole game ends, at most MAX_NUM_OF_STEPS steps.
+    Stops early when the game is over. Returns the number of steps played and,
+    if with_events, the delta of every step without its log lines.
+    The caller must hold the game's lock."""
+    max_steps = MAX_NUM_OF_STEPS if until else min(n, MAX_NUM_OF_STEPS)
+    events = []
+    steps = 0
+    while steps < max_steps and not game_is_over(game["state"]):
+        if with_events:
+            before = dict(game["state"])
+            before["status"] = list(before.get("status", []))
+        advance_game(game)
+        steps += 1
+        if with_events:
+            events.append(
+                game_step_delta(
+                    before, game["state"], game["log"], [], game["version"]
+                )
+            )
+        # The table is cleared when a round ends
+        if until == "round_end" and not game["state"]["table_attack"]:
+            break
+    return steps, events
 
 
 @app.post("/api/games/{game_id}/step", response_model=GameState)
-async def step_game(game_id: str):
+async def step_game(
+    game_id: str,
+    log_offset: int = 0,
+    log_limit: Optional[int] = None,
+    since: Optional[int] = None,
+    exclude: Optional[str] = None,
+    n: int = 1,
+    until: Optional[str] = None,
+    events: bool = False,
+):
+    """Play n steps (one by default, at most MAX_NUM_OF_STEPS), or until the
+    round or game ends (until=round_end|game_end), and return the final state
+    only."""
     game = GAMES.get(game_id)
     if not game:
         return JSONResponse({"error": "Game not found"}, status_code=404)
-    bots = [load_bot(os.path.join(BOTS_DIR, fname)) for fname in game["bots"]]
-    state = game["state"]
-    # Pass bot_names for display
-    new_state = advance_game_step(state, bots, game.get("bot_names", []))
-    game["state"] = new_state
-    return GameState(id=game_id, bots=game.get("bot_names", []), state=new_state)
+    if until is not None and until not in STEP_UNTIL_MODES:
+        return JSONResponse(
+            {"error": f"until must be one of {STEP_UNTIL_MODES}"}, status_code=400
+        )
+
+    def play():
+        steps, step_events = advance_game_steps(game, n, until, events)
+        state = game_state_for_ui(game, log_offset, log_limit, since, exclude)
+        return steps, step_events, state
+
+    steps, step_events, state = await run_with_game_lock(game, play)
+    return GameState(
+        id=game_id,
+        bots=game.get("bot_names", []),
+        state=state,
+        steps=steps,
+        events=step_events if events else None,
+    )
+
+
+# Fields sent in a step delta whenever they changed
+DELTA_FIELDS = [
+    "attacker",
+    "defender",
+    "curr_player",
+    "deck_count",
+    "num_of_burned_cards",
+    "status",
+]
+
+
+def game_step_delta(before, after, game_log, log_sizes_before, version):
+    """What changed in a game during a step, with cards rendered for the UI:
+    the version of the game after the step, the cards that left and joined
+    each hand, the table slots (only if they changed), the changed fields of
+    DELTA_FIELDS and the new log lines."""
+    delta = {"version": version}
+    hands_removed = {}
+    hands_added = {}
+    for i, (old_hand, new_hand) in enumerate(zip(before["hands"], after["hands"])):
+        removed = [c for c in old_hand if c not in new_hand]
+        added = [c for c in new_hand if c not in old_hand]
+        if removed:
+            hands_removed[i] = card_list_tuples_to_strs(removed)
+        if added:
+            hands_added[i] = card_list_tuples_to_strs(added)
+    if hands_removed:
+        delta["hands_removed"] = hands_removed
+    if hands_added:
+        delta["hands_added"] = hands_added
+    for key in ["table_attack", "table_defence"]:
+        if before[key] != after[key]:
+            delta[key] = card_list_tuples_to_strs(after[key])
+    for key in DELTA_FIELDS:
+        if before.get(key) != after.get(key):
+            delta[key] = after.get(key)
+    new_log = {}
+    for i, size in enumerate(log_sizes_before):
+        entries = game_log.read(i, size)
+        if entries:
+            new_log[i] = entries
+    if new_log:
+        delta["log"] = new_log
+    return delta
+
+
+@app.get("/api/games/{game_id}/stream")
+async def stream_game(game_id: str, delay: float = 0.5):
+    """Play the game on the server, one step every `delay` seconds, and push
+    a delta of every step (see game_step_delta) as a Server-Sent Event.
+    An 'end' event is sent when the game is over."""
+    game = GAMES.get(game_id)
+    if not game:
+        return JSONResponse({"error": "Game not found"}, status_code=404)
+
+    def play_step():
+        if game_is_over(game["state"]):
+            return None
+        # The engine updates some fields of the state it is given in place
+        before = dict(game["state"])
+        if "status" in before:
+            before["status"] = list(before["status"])
+        log_sizes_before = game["log"].sizes()
+        advance_game(game)
+        return game_step_delta(
+            before, game["state"], game["log"], log_sizes_before, game["version"]
+        )
+
+    async def events():
+        step = 0
+        while not game_is_over(game["state"]) and step < MAX_NUM_OF_STEPS:
+            delta = await run_with_game_lock(game, play_step)
+            if delta is None:
+                break
+            step += 1
+            yield f"data: {json.dumps(delta, ensure_ascii=False)}\n\n"
+            await asyncio.sleep(delay)
+        yield "event: end\ndata: {}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
 
 
 max_steps_achieved = 0
 
 
-def main(to_print: bool = False, randomize_order: bool = False):
+def main(to_print: bool = False):
     global max_steps_achieved
 
     import argparse
-    import time
-
-    MAX_NUM_OF_STEPS = 700  # Limit to prevent infinite loops
 
     parser = argparse.ArgumentParser(description="Run Durak game in CLI mode (no UI).")
     parser.add_argument(
@@ -304,7 +573,7 @@ def main(to_print: bool = False, randomize_order: bool = False):
     # Prepare bot filenames and paths
     bot_filenames = args.bots
     bot_paths = [os.path.join(BOTS_DIR, fname) for fname in bot_filenames]
-    bots = [load_bot(path) for path in bot_paths]
+    bots = [fresh_bot_instance(load_bot_cached(path)) for path in bot_paths]
     bot_names = []
     for bot_instance, fname in zip(bots, bot_filenames):
         bot_name = getattr(bot_instance, "name", None)
@@ -319,12 +588,17 @@ def main(to_print: bool = False, randomize_order: bool = False):
 
     bot_names = [f"Player {i}: {bot_names[i]}" for i in range(len(bot_names))]
 
-    state = create_game_state(len(bot_filenames))
+    state, rng = create_game_state(len(bot_filenames))
+    state["bot_states"] = in_place_bot_states(bots)
+    game_log = GameLog(len(bot_filenames)) if to_print else None
+    set_bots_log_level(bots, game_log)
+    clock = BotClock(len(bot_filenames), TIME_BANK_PER_GAME)
 
     if to_print:
         print("=== Durak CLI Game ===")
-        print(f"Trump card: {state['trump_card']}")
-        print(f"Trump suit: {state['trump_suit']}")
+        print(f"Seed: {state['seed']}")
+        print(f"Trump card: {card_tuple_to_str(state['trump_card'])}")
+        print(f"Trump suit: {SUITS[state['trump_suit']]}")
         print(f"Bots: {bot_names}")
         print("Starting game...\n")
 
@@ -337,12 +611,12 @@ def main(to_print: bool = False, randomize_order: bool = False):
             )
             print(f"Hands: {[len(h) for h in state['hands']]}")
             print(f"Deck count: {state['deck_count']}")
-            print(f"Table attack: {state['table_attack']}")
-            print(f"Table defence: {state['table_defence']}")
+            print(f"Table attack: {card_list_tuples_to_strs(state['table_attack'])}")
+            print(f"Table defence: {card_list_tuples_to_strs(state['table_defence'])}")
             # Print last log entries for each bot
-            for idx, bot_log in enumerate(state["log"]):
-                if bot_log:
-                    print(f"Log [{bot_names[idx]}]: {bot_log[-1]}")
+            for idx in range(len(game_log)):
+                if game_log.last(idx):
+                    print(f"Log [{bot_names[idx]}]: {game_log.last(idx)}")
         # Check for game end
         # A player is only out if their hand is empty AND the deck is empty
         alive = [
@@ -370,85 +644,247 @@ def main(to_print: bool = False, randomize_order: bool = False):
                         print(f"\nLOSER: {bot_names[alive[0]]}")
                     return alive[0]  # Return the index of the loser
         # Advance game step
-        state = advance_game_step(state, bots, bot_names)
+        state = advance_game_step(
+            state, bots, bot_names, game_log, rng=rng, clock=clock
+        )
         step += 1
 
 
-def tournament(num_of_games=10, to_print=False):
-    loser_count_lst = [0 for _ in range(len(sys.argv) - 1)]
-    count_proper_games = 0
-    max_total_games = 2 * num_of_games
-    game_idx = 0
-    bot_filenames_orig = sys.argv[1:]  # Save original order
-    while count_proper_games < num_of_games and game_idx < max_total_games:
-        if to_print:
-            print(f"Game {game_idx + 1} of {num_of_games}:")
-
-        # Randomize player order for this game
-        bot_filenames = bot_filenames_orig[:]
-        random.shuffle(bot_filenames)
-        sys.argv = ["main.py"] + bot_filenames
-        loser = main(to_print=False)
-        # `sys.stdout = sys.__stdout__
-        if loser != -1:
-            if to_print:
-                print(f"Game {game_idx + 1} ended with loser: {loser}")
-            # Map loser index back to original bot order
-            orig_idx = bot_filenames_orig.index(bot_filenames[loser])
-            loser_count_lst[orig_idx] += 1
-            count_proper_games += 1
-        elif to_print:
-            print(f"Game {game_idx + 1} ended without a loser (max steps reached).")
-        game_idx += 1
+def tournament(
+    num_of_games=10,
+    to_print=False,
+    bot_filenames=None,
+    max_workers=None,
+    seed=None,
+    duplicate=False,
+    early_stop=None,
+    timing=False,
+):
+    global max_steps_achieved
+
+    if bot_filenames is None:
+        bot_filenames = sys.argv[1:]
+    if not bot_filenames:
+        sys.exit("usage: main.py bots [bots ...]")
+    bot_paths = [os.path.join(BOTS_DIR, fname) for fname in bot_filenames]
+
+    num_of_finished_games = 0
+
+    def print_result(result):
+        nonlocal num_of_finished_games
+        num_of_finished_games += 1
+        if result["loser"] != -1:
+            print(f"Game {num_of_finished_games} ended with loser: {result['loser']}")
+        else:
+            print(
+                f"Game {num_of_finished_games} ended without a loser (max steps reached)."
+            )
+
+    results = play_tournament(
+        bot_paths,
+        num_of_games,
+        max_workers=max_workers,
+        seed=seed,
+        on_result=print_result if to_print else None,
+        duplicate=duplicate,
+        stop_rule=(
+            make_stop_rule(early_stop, len(bot_paths), duplicate)
+            if early_stop
+            else None
+        ),
+        timing=timing,
+    )
+    loser_count_lst = results["loser_count_lst"]
+    num_of_infinite_games = results["num_of_infinite_games"]
+    for game in results["games"]:
+        if game["loser"] != -1:
+            max_steps_achieved = max(max_steps_achieved, game["num_of_steps"])
     print("\n=== Tournament Results ===")
+    print(f"Seed: {results['seed']}")
     for i, count in enumerate(loser_count_lst):
         print(f"Player {i} lost {count} times.")
-    num_of_infinite_games = game_idx - count_proper_games
     print(f"\n{num_of_infinite_games} games got caught in an infinite loop.")
+    if duplicate:
+        print(f"\n=== Loss Rate over {len(results['deals'])} Deals ===")
+        for i, stats in enumerate(results["deal_stats"]):
+            print(f"Player {i}: {stats['loss_rate']:.3f} ± {stats['std_error']:.3f}")
+    if early_stop:
+        summary = results["stop_rule"]
+        print(f"\n=== Early Stopping ({summary['rule']}) ===")
+        print(f"Games: {summary['games']}, separated: {summary['separated']}")
+        for pair in summary.get("pairs", []):
+            if not pair["decided"]:
+                decision = "undecided"
+            elif pair["weaker"] == -1:
+                decision = "even"
+            else:
+                decision = f"Player {pair['weaker']} is weaker"
+            print(
+                f"Players {pair['bots']}: {decision} "
+                f"(confidence {pair['confidence']:.3f})"
+            )
+        for i, half_width in enumerate(summary.get("half_widths", [])):
+            loss_rate = summary["loss_rates"][i]
+            print(f"Player {i}: {loss_rate:.3f} ± {half_width:.3f}")
+    if timing:
+        print("\n=== Bot Timing (calls, CPU ms/call, max wall ms) ===")
+        for i, bot_timing in enumerate(results["timing"]):
+            for action, (calls, cpu, wall, max_wall) in sorted(bot_timing.items()):
+                print(
+                    f"Player {i} {action}: {calls}, "
+                    f"{1000 * cpu / calls:.3f}, {1000 * max_wall:.3f}"
+                )
 
     return loser_count_lst, num_of_infinite_games
 
 
+def run_tournament_job(job):
+    """Play a tournament job (in a background thread), updating its progress
+    after every finished game."""
+    if job["status"] != "queued":
+        # Cancelled before it started
+        return
+    job["status"] = "running"
+
+    def record_result(result):
+        job["games_completed"] += 1
+        for bot_timing, game_timing in zip(job["timing"], result["timing"]):
+            merge_timing(bot_timing, game_timing)
+        if result["loser"] != -1:
+            job["loser_count_lst"][result["loser"]] += 1
+        else:
+            job["infinite_games"] += 1
+        if job["duplicate"]:
+            add_to_deal(job["deals"], result, len(job["bots"]))
+
+    bot_paths = [os.path.join(BOTS_DIR, fname) for fname in job["bots"]]
+    try:
+        play_tournament(
+            bot_paths,
+            job["num_games"],
+            seed=job["seed"],
+            on_result=record_result,
+            should_stop=lambda: job["status"] == "cancelled",
+            in_process=False,
+            duplicate=job["duplicate"],
+            stop_rule=job["stop_rule"],
+            timing=job["timing_requested"],
+            sandboxed=SANDBOX_BOTS,
+        )
+        if job["status"] == "running":
+            job["status"] = "finished"
+    except Exception as e:
+        traceback.print_exc()
+        job["status"] = "failed"
+        job["error"] = str(e)
+
+
+def tournament_job_summary(job_id, job):
+    return {
+        "job_id": job_id,
+        "status": job["status"],
+        "num_games": job["num_games"],
+        "seed": job["seed"],
+        "games_completed": job["games_completed"],
+        "loser_count_lst": list(job["loser_count_lst"]),
+        "total_games": job["games_completed"],
+        "infinite_games": job["infinite_games"],
+        "timing": job_timing_summary(job["timing"]),
+        "error": job["error"],
+        "duplicate": job["duplicate"],
+        "deal_stats": (
+            deal_loss_stats(list(job["deals"].values()), len(job["bots"]))
+            if job["duplicate"]
+            else None
+        ),
+        # The estimates and confidence of an early stopping tournament
+        "stop_rule": job["stop_rule"].summary() if job["stop_rule"] else None,
+    }
+
+
+def job_timing_summary(timing):
+    """The calls and total CPU and wall seconds of every bot, with its
+    slowest call, over all action types."""
+    summary = []
+    for bot_timing in timing:
+        stats = list(bot_timing.values())
+        summary.append(
+            {
+                "calls": sum(s[0] for s in stats),
+                "cpu": sum(s[1] for s in stats),
+                "wall": sum(s[2] for s in stats),
+                "max_wall": max((s[3] for s in stats), default=0.0),
+            }
+        )
+    return summary
+
+
 @app.post("/api/tournament")
 async def run_tournament(request: Request):
+    """Start a tournament in the background and return its job id. Poll
+    GET /api/tournament/{job_id} for progress and (partial) results."""
     data = await request.json()
     bot_filenames = data.get("bots", [])
     num_games = int(data.get("numGames", 10))
     if len(bot_filenames) < 2:
         return JSONResponse({"error": "At least 2 bots required"}, status_code=400)
-    # Prepare sys.argv for tournament
-    sys_argv_backup = sys.argv
-    sys.argv = ["main.py"] + bot_filenames
-    # Redirect stdout to capture tournament output
-    # old_stdout = sys.stdout
-    # stdout_capture = io.StringIO()
-    # sys.stdout = stdout_capture
-    try:
-        loser_count_lst, num_of_infinite_games = tournament(
-            num_of_games=num_games, to_print=True
+    # The seed of a tournament makes it reproducible
+    seed = data.get("seed")
+    seed = int(seed) if seed is not None else random.randrange(2**32)
+    # Duplicate tournaments play whole deals (a game per seat rotation)
+    duplicate = bool(data.get("duplicate", False))
+    if duplicate:
+        num_games = -(-num_games // len(bot_filenames)) * len(bot_filenames)
+    # With early stopping, numGames is the most games to play
+    early_stop = data.get("earlyStop")
+    if early_stop and early_stop not in STOP_RULES:
+        return JSONResponse(
+            {"error": f"Unknown early stopping rule: {early_stop}"}, status_code=400
         )
-        # output = stdout_capture.getvalue()
-    except Exception as e:
-        # sys.stdout = old_stdout
-        # sys.argv = sys_argv_backup
-        return JSONResponse({"error": str(e)}, status_code=500)
-    # sys.stdout = old_stdout
-    sys.argv = sys_argv_backup
-    # Count infinite games from output
-    # infinite_games = 0
-    # total_games = num_games
-    # for line in output.splitlines():
-    #     if "infinite loop" in line:
-    #         try:
-    #             infinite_games = int(line.split()[0])
-    #         except Exception:
-    #             pass
-    return {
-        "loser_count_lst": loser_count_lst,
-        "total_games": sum(loser_count_lst) + num_of_infinite_games,
-        "infinite_games": num_of_infinite_games,
-        # "output": output,
+    job_id = uuid.uuid4().hex
+    job = {
+        "bots": bot_filenames,
+        "num_games": num_games,
+        "seed": seed,
+        "status": "queued",
+        "games_completed": 0,
+        "loser_count_lst": [0 for _ in bot_filenames],
+        "infinite_games": 0,
+        "timing": [{} for _ in bot_filenames],
+        # Time every bot call (to find slow bots), at some cost in speed
+        "timing_requested": bool(data.get("timing", False)),
+        "error": None,
+        "duplicate": duplicate,
+        "deals": {},
+        "stop_rule": (
+            make_stop_rule(early_stop, len(bot_filenames), duplicate)
+            if early_stop
+            else None
+        ),
     }
+    TOURNAMENTS[job_id] = job
+    asyncio.get_running_loop().run_in_executor(
+        TOURNAMENT_EXECUTOR, run_tournament_job, job
+    )
+    return tournament_job_summary(job_id, job)
+
+
+@app.get("/api/tournament/{job_id}")
+def get_tournament(job_id: str):
+    job = TOURNAMENTS.get(job_id)
+    if not job:
+        return JSONResponse({"error": "Tournament not found"}, status_code=404)
+    return tournament_job_summary(job_id, job)
+
+
+@app.delete("/api/tournament/{job_id}")
+def cancel_tournament(job_id: str):
+    job = TOURNAMENTS.get(job_id)
+    if not job:
+        return JSONResponse({"error": "Tournament not found"}, status_code=404)
+    if job["status"] in ("queued", "running"):
+        job["status"] = "cancelled"
+    return tournament_job_summary(job_id, job)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,68 @@
+# Headless game simulation, for tournaments and benchmarks.
+# Unlike the API in main.py, it keeps no log, renders no strings and touches
+# no files: a whole game is played in one call on an in-memory state.
+
+import random
+from typing import Any, Dict, List, Optional
+
+from bot_clock import BotClock
+from bot_loader import fresh_bot_instance
+from configurations import MAX_NUM_OF_STEPS, TIME_BANK_PER_GAME
+from durak_game import (
+    advance_game_step,
+    create_deck,
+    new_game_state,
+    in_place_bot_states,
+    set_bots_log_level,
+)
+
+
+def game_is_over(state: Dict[str, Any]) -> bool:
+    # A player is only out if their hand is empty AND the deck is empty
+    if state["deck"]:
+        return False
+    return sum(1 for hand in state["hands"] if hand) <= 1
+
+
+def simulate_game(
+    bots: List[Any],
+    seed: Optional[int] = None,
+    max_steps: int = MAX_NUM_OF_STEPS,
+    timing: bool = False,
+) -> Dict[str, Any]:
+    """Play a full game between the given bots (in seating order) and return
+    a compact result record:
+        seed: the seed the game was played with,
+        loser: index of the losing bot, or -1 if there is no loser (the step
+            limit was reached or nobody was left with cards),
+        num_of_steps: the number of steps played,
+        timing: the time stats of every bot (see BotClock.summary), empty
+            unless timing is True.
+    Every bot has a time bank of TIME_BANK_PER_GAME seconds, if it is set.
+    Bot calls are only timed with timing or a time bank.
+    No log is kept, so the bots' own logging is turned off.
+    The given bots are used as templates and are not modified."""
+    if seed is None:
+        seed = random.randrange(2**32)
+    rng = random.Random(seed)
+    bots = [fresh_bot_instance(bot) for bot in bots]
+    set_bots_log_level(bots, None)
+    state = new_game_state(create_deck(rng), len(bots), rng)
+    state["bot_states"] = in_place_bot_states(bots)
+    clock = (
+        BotClock(len(bots), TIME_BANK_PER_GAME)
+        if timing or TIME_BANK_PER_GAME is not None
+        else None
+    )
+    step = 0
+    while step < max_steps and not game_is_over(state):
+        state = advance_game_step(state, bots, rng=rng, clock=clock)
+        step += 1
+    losers = [i for i, hand in enumerate(state["hands"]) if hand]
+    loser = losers[0] if game_is_over(state) and len(losers) == 1 else -1
+    return {
+        "seed": seed,
+        "loser": loser,
+        "num_of_steps": step,
+        "timing": clock.summary() if timing else [{} for _ in bots],
+    }
@@ -0,0 +1,82 @@
+import random
+import sys
+import threading
+from time import perf_counter
+
+from bot_watchdog import deadline
+
+NUM_OF_THREADS = 6
+
+
+def busy(seconds):
+    end = perf_counter() + seconds
+    while perf_counter() < end:
+        pass
+
+
+def run_threads(target):
+    """Run target(seed) in NUM_OF_THREADS threads at once, and return the
+    exceptions they raised."""
+    errors = []
+
+    def run(seed):
+        try:
+            target(seed)
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [
+        threading.Thread(target=run, args=(seed,)) for seed in range(NUM_OF_THREADS)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(60)
+    assert not any(thread.is_alive() for thread in threads)
+    return errors
+
+
+def test_only_overruns_time_out():
+    def play(seed):
+        rng = random.Random(seed)
+        for _ in range(10):
+            if rng.random() < 0.5:
+                timed_out = False
+                try:
+                    with deadline(0.01):
+                        while True:
+                            pass
+                except TimeoutError:
+                    timed_out = True
+                assert timed_out
+            else:
+                with deadline(5.0):
+                    busy(0.001)
+            # Nothing may be left pending for the code after the block
+            busy(0.005)
+
+    assert run_threads(play) == []
+
+
+def test_no_timeout_leaks_near_the_deadline():
+    # Blocks that end just around their deadline either time out inside
+    # deadline() or not at all: the code after them never gets a TimeoutError.
+    # Frequent thread switches make the watchdog fire at every point.
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(0.00005)
+
+    def play(seed):
+        rng = random.Random(seed)
+        for _ in range(300):
+            try:
+                with deadline(rng.uniform(0, 0.0005)):
+                    busy(rng.uniform(0, 0.0005))
+            except TimeoutError:
+                pass
+            busy(0.0002)
+
+    try:
+        errors = run_threads(play)
+    finally:
+        sys.setswitchinterval(switch_interval)
+    assert errors == []
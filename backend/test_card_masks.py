@@ -0,0 +1,115 @@
+import random
+
+import pytest
+
+from card_masks import (
+    BEATS,
+    CARDS,
+    NUM_OF_SUITS,
+    attack_with_card_mask,
+    defend_with_card_mask,
+    forward_with_card_mask,
+    mask_from_cards,
+)
+from configurations import MAX_ATTACK_SIZE_AFTER_BURN
+from durak_game import (
+    attack_with_card_list,
+    defend_with_card_list,
+    forward_with_card_list,
+    valid_to_defend,
+)
+
+# The mask functions are compared with their list counterparts in durak_game
+# on random tables and hands
+NUM_OF_ROUNDS = 20000
+
+
+def random_tables(seed):
+    """(kozar_suit, attack, defence, hand, candidates) for random tables."""
+    rng = random.Random(seed)
+    for _ in range(NUM_OF_ROUNDS):
+        deck = CARDS[:]
+        rng.shuffle(deck)
+        kozar_suit = rng.randrange(NUM_OF_SUITS)
+        table_size = rng.randint(1, MAX_ATTACK_SIZE_AFTER_BURN)
+        num_of_attacks = rng.randint(0, table_size)
+        attack = deck[:num_of_attacks] + [None] * (table_size - num_of_attacks)
+        defence = [
+            deck.pop() if card is not None and rng.random() < 0.4 else None
+            for card in attack
+        ]
+        del deck[:num_of_attacks]
+        hand = deck[: rng.randint(0, 12)]
+        candidates = rng.sample(hand + deck[-6:], rng.randint(0, 6))
+        yield rng, kozar_suit, attack, defence, hand, candidates
+
+
+@pytest.mark.parametrize("kozar_suit", range(NUM_OF_SUITS))
+def test_beats_table(kozar_suit):
+    for bit_index, attacking_card in enumerate(CARDS):
+        expected = mask_from_cards(
+            card
+            for card in CARDS
+            if valid_to_defend(card, attacking_card, kozar_suit)
+        )
+        assert BEATS[kozar_suit][bit_index] == expected, attacking_card
+
+
+def test_attack_with_card_mask():
+    for _, _, attack, defence, hand, candidates in random_tables(0):
+        list_attack = attack[:]
+        mask_attack = attack[:]
+        list_hand = hand[:]
+        expected = attack_with_card_list(list_attack, defence[:], candidates, list_hand)
+        table_mask = mask_from_cards(attack + defence)
+        actual, hand_mask, new_table = attack_with_card_mask(
+            mask_attack, table_mask, candidates, mask_from_cards(hand)
+        )
+        assert (expected, list_attack) == (actual, mask_attack)
+        assert hand_mask == mask_from_cards(list_hand)
+        assert new_table == mask_from_cards(mask_attack + defence)
+
+
+def test_defend_with_card_mask():
+    for rng, kozar_suit, attack, defence, hand, candidates in random_tables(1):
+        indexes = [rng.randint(-1, len(attack)) for _ in candidates]
+        list_defence = defence[:]
+        mask_defence = defence[:]
+        list_hand = hand[:]
+        expected = defend_with_card_list(
+            indexes, candidates, attack, list_defence, list_hand, kozar_suit
+        )
+        cards, successful_indexes, hand_mask, new_table = defend_with_card_mask(
+            indexes,
+            candidates,
+            attack,
+            mask_defence,
+            mask_from_cards(attack + defence),
+            mask_from_cards(hand),
+            kozar_suit,
+        )
+        assert expected == (cards, successful_indexes)
+        assert list_defence == mask_defence
+        assert hand_mask == mask_from_cards(list_hand)
+        assert new_table == mask_from_cards(attack + mask_defence)
+
+
+def test_forward_with_card_mask():
+    for rng, _, attack, defence, hand, candidates in random_tables(2):
+        if attack[0] is None:
+            continue
+        allowed = rng.randint(0, 6)
+        list_attack = attack[:]
+        mask_attack = attack[:]
+        list_hand = hand[:]
+        expected = forward_with_card_list(candidates, list_attack, list_hand, allowed)
+        actual, hand_mask, new_table = forward_with_card_mask(
+            candidates,
+            mask_attack,
+            mask_from_cards(attack + defence),
+            mask_from_cards(hand),
+            allowed,
+        )
+        assert (expected, list_attack) == (actual, mask_attack)
+        assert hand_mask == mask_from_cards(list_hand)
+        assert new_table == mask_from_cards(mask_attack + defence)
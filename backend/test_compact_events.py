@@ -0,0 +1,103 @@
+import random
+
+import pytest
+
+from abstract_bot import AbstractBot
+from configurations import MAX_NUM_OF_STEPS
+from durak_actions import Input_actions
+from durak_game import (
+    advance_game_step,
+    create_deck,
+    in_place_bot_states,
+    new_game_state,
+)
+from simulation import game_is_over
+
+# One event of every kind, in the shapes the engine sends them, with the
+# edge cases of each field: empty card lists and tuples, -1 indexes, the
+# highest card, and forwarded attacks
+EVENTS = [
+    (Input_actions.FIRST_ATTACK,),
+    (Input_actions.OPTIONAL_ATTACK,),
+    (Input_actions.DEFENCE,),
+    (Input_actions.TO_HAND, [(0, 0), (12, 3)]),
+    (Input_actions.TO_HAND, []),
+    (Input_actions.BURN, [(4, 1), (5, 1), (12, 0), (11, 2)]),
+    (Input_actions.BURN, []),
+    (Input_actions.GAME_INIT, 4, 2, [(3, 1), (7, 0), (12, 3)], (6, 2), 1, 3),
+    (Input_actions.GAME_INIT, 2, 0, [], (0, 0), 0, -1),
+    (Input_actions.OPTIONAL_ATTACK_PASSIVE, 1, [(9, 2)]),
+    (Input_actions.OPTIONAL_ATTACK_PASSIVE, 3, []),
+    (Input_actions.FIRST_ATTACK_PASSIVE, 0, [(2, 0), (2, 3)]),
+    (Input_actions.DEFENCE_PASSIVE, 1, [(10, 0), (4, 3)], [0, 1]),
+    (Input_actions.DEFENCE_PASSIVE, 1, [], []),
+    (Input_actions.TAKE_PASSIVE, 2, ((2, 0), (2, 3), (10, 0))),
+    (Input_actions.TAKE_PASSIVE, 2, ()),
+    (Input_actions.FORWARD_PASSIVE, 1, [(2, 1)]),
+    (Input_actions.FORWARD_PASSIVE, 3, [(5, 0), (5, 2), (5, 3)]),
+    (Input_actions.PASS_PASSIVE, 0),
+    (Input_actions.WINNER_PASSIVE, 3),
+    (Input_actions.WINNER_PASSIVE, -1),
+]
+
+
+def test_every_event_kind_is_covered():
+    assert {event[0] for event in EVENTS} == set(Input_actions)
+
+
+@pytest.mark.parametrize("event", EVENTS, ids=lambda event: event[0].name)
+def test_round_trip(event):
+    encoded = AbstractBot.compact_event(event)
+    assert isinstance(encoded, bytes)
+    expanded = AbstractBot.expand_event(encoded)
+    assert expanded == event
+    # Lists stay lists and tuples stay tuples
+    assert [type(field) for field in expanded] == [type(field) for field in event]
+
+
+def test_other_fields_are_kept_as_they_are():
+    for event in [
+        (Input_actions.WINNER_PASSIVE, 300),
+        (Input_actions.PASS_PASSIVE, "0"),
+        (Input_actions.TO_HAND, [(0, 4)]),
+    ]:
+        assert AbstractBot.compact_event(event) is event
+
+
+class RecordingBot(AbstractBot):
+    EVENT_HISTORY_SIZE = None
+
+    def first_attack(self):
+        return [self.get_hand()[0]]
+
+    def optional_attack(self):
+        return self.get_legal_attacks()[:1]
+
+    def defence(self):
+        forwards = self.get_legal_forwards()
+        if forwards:
+            return forwards[:1], []
+        defences = self.get_legal_defences()
+        if not defences:
+            return [], []
+        card, index = defences[0]
+        return [card], [index]
+
+
+def test_round_trip_of_played_games():
+    kinds = set()
+    for seed in range(10):
+        rng = random.Random(seed)
+        bots = [RecordingBot() for _ in range(3)]
+        state = new_game_state(create_deck(rng), len(bots), rng)
+        state["bot_states"] = in_place_bot_states(bots)
+        for _ in range(MAX_NUM_OF_STEPS):
+            if game_is_over(state):
+                break
+            state = advance_game_step(state, bots, rng=rng)
+        for bot in bots:
+            for event in bot.get_raw_events():
+                encoded = AbstractBot.compact_event(event)
+                assert AbstractBot.expand_event(encoded) == event
+                kinds.add(event[0])
+    assert Input_actions.FORWARD_PASSIVE in kinds
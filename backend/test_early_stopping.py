@@ -0,0 +1,94 @@
+import math
+
+from early_stopping import ConfidenceStop, SPRTStop
+
+# The stopping rules are fed synthetic result records (only the fields they
+# read), so their stop points follow from the default settings:
+# alpha = beta = 0.05 and margin = 0.1 put the SPRT boundaries at +-log(19),
+# and a loss of the weaker bot moves its log likelihood ratio by log(1.2).
+
+
+def feed(rule, losers):
+    """Add games with the given losers, and return the number of games after
+    which the rule was first decided (None if it never was)."""
+    for game, loser in enumerate(losers, 1):
+        rule.add({"loser": loser, "seed": game})
+        if rule.decided():
+            return game
+    return None
+
+
+def test_sprt_finds_weaker_bot():
+    rule = SPRTStop(2)
+    # 17 * log(1.2) is the first multiple past log(19)
+    assert feed(rule, [0] * 100) == 17
+    assert rule.decision(0, 1) == "a"
+    assert math.ceil(math.log(19) / math.log(1.2)) == 17
+
+
+def test_sprt_finds_even_bots():
+    rule = SPRTStop(2)
+    assert feed(rule, [0, 1] * 100) == 146
+    assert rule.decision(0, 1) == "even"
+    assert rule.summary()["pairs"][0]["weaker"] == -1
+
+
+def test_sprt_decision_is_frozen():
+    rule = SPRTStop(2)
+    feed(rule, [1] * 17)
+    assert rule.decision(0, 1) == "b"
+    confidence = rule.summary()["pairs"][0]["confidence"]
+    # Later games that point the other way do not undo the decision
+    for _ in range(200):
+        rule.add({"loser": 0})
+    assert rule.decision(0, 1) == "b"
+    assert rule.decided()
+    assert rule.summary()["pairs"][0]["confidence"] == confidence
+
+
+def test_sprt_waits_for_every_pair():
+    rule = SPRTStop(3)
+    # Bot 0 loses all the games: pairs (0, 1) and (0, 2) are decided, but
+    # there is no evidence about (1, 2) yet
+    assert feed(rule, [0] * 17) is None
+    assert rule.decision(0, 1) == "a"
+    assert rule.decision(0, 2) == "a"
+    assert rule.decision(1, 2) is None
+
+
+def test_sprt_ignores_games_without_loser():
+    rule = SPRTStop(2)
+    assert feed(rule, [-1] * 50) is None
+    assert rule.games == 50
+    assert rule.loser_count_lst == [0, 0]
+
+
+def test_confidence_stop_point():
+    rule = ConfidenceStop(2)
+    # The 95% Wilson interval of a loss rate of 1/2 is narrower than +-0.05
+    # from 381 games on
+    assert feed(rule, [0, 1] * 300) == 381
+
+
+def test_confidence_waits_for_min_games():
+    rule = ConfidenceStop(2, half_width=1.0, min_games=20)
+    assert feed(rule, [0] * 100) == 20
+
+
+def test_confidence_counts_games_without_loser():
+    rule = ConfidenceStop(2)
+    feed(rule, [-1] * 10 + [0] * 10)
+    assert rule.games == 20
+    assert rule.loser_count_lst == [10, 0]
+    assert rule.summary()["loss_rates"] == [0.5, 0.0]
+
+
+def test_confidence_duplicate_needs_deals():
+    rule = ConfidenceStop(2, duplicate=True, min_games=4)
+    # Every deal (seed) is played twice and lost once by each bot, so there is
+    # no spread between deals
+    for deal in range(2):
+        rule.add({"loser": 0, "seed": deal})
+        rule.add({"loser": 1, "seed": deal})
+    assert rule.decided()
+    assert rule.summary()["half_widths"] == [0.0, 0.0]
@@ -0,0 +1,33 @@
+import os
+import shutil
+
+import pytest
+
+pytest.importorskip("httpx")
+from fastapi.testclient import TestClient
+
+import main
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    bot_path = os.path.join(os.path.dirname(main.__file__), "heuristic_bot.py")
+    shutil.copy(bot_path, tmp_path)
+    monkeypatch.setattr(main, "BOTS_DIR", str(tmp_path))
+    return TestClient(main.app)
+
+
+def test_heuristic_bot_game_is_served(client):
+    """The bot states in the game's response (which include the bots' card
+    trackers) must serialize."""
+    response = client.post(
+        "/api/games", json={"bots": ["heuristic_bot.py"] * 2, "seed": 5}
+    )
+    assert response.status_code == 200
+    game_id = response.json()["id"]
+    for _ in range(30):
+        response = client.post(f"/api/games/{game_id}/step")
+        assert response.status_code == 200
+    response = client.get(f"/api/games/{game_id}")
+    assert response.status_code == 200
+    assert response.json()["state"]["bot_states"][0]["card_tracker"]["unseen"]
@@ -0,0 +1,93 @@
+import copy
+import random
+
+import pytest
+
+from configurations import MAX_NUM_OF_STEPS
+from durak_actions import Input_actions, Output_actions
+from durak_game import (
+    advance_game_step,
+    create_deck,
+    legal_actions,
+    new_game_state,
+    padded_table,
+)
+from simulation import game_is_over
+
+# Events that are not about the action played
+INFO_EVENTS = (Input_actions.GAME_INIT, Input_actions.TO_HAND)
+# The event the bots are told of when the engine accepts an action
+PASSIVE_EVENTS = {
+    Output_actions.DEFEND: Input_actions.DEFENCE_PASSIVE,
+    Output_actions.TAKE: Input_actions.TAKE_PASSIVE,
+    Output_actions.PASS: Input_actions.PASS_PASSIVE,
+    Output_actions.FORWARD: Input_actions.FORWARD_PASSIVE,
+}
+
+
+class ScriptedBot:
+    """Returns the given action when asked, and records the passive events in
+    a list shared by all the bots."""
+
+    def __init__(self, action, events):
+        self.action = action
+        self.events = events
+
+    def call(self, event, *args):
+        if event[0] in (
+            Input_actions.FIRST_ATTACK,
+            Input_actions.OPTIONAL_ATTACK,
+            Input_actions.DEFENCE,
+        ):
+            return {"action": self.action}
+        self.events.append(event)
+        return {}
+
+
+def play_action(state, action):
+    """The state after the current player plays action, and the events the
+    bots were told of (a player who just played their last card is not told
+    of their own move)."""
+    events = []
+    state = copy.deepcopy(state)
+    bots = [ScriptedBot(action, events) for _ in state["hands"]]
+    state["bot_states"] = [{} for _ in bots]
+    state = advance_game_step(state, bots, rng=random.Random(0))
+    return state, events
+
+
+def expected_event(state, player, action):
+    if action[0] == Output_actions.ATTACK:
+        table_attack, _ = padded_table(state)
+        if any(card is not None for card in table_attack):
+            return (Input_actions.OPTIONAL_ATTACK_PASSIVE, player, action[1])
+        return (Input_actions.FIRST_ATTACK_PASSIVE, player, action[1])
+    return (PASSIVE_EVENTS[action[0]], player, *action[1:])
+
+
+@pytest.mark.parametrize("num_of_players", [2, 3, 4])
+def test_legal_actions_are_accepted(num_of_players):
+    for seed in range(4):
+        rng = random.Random(seed)
+        state = new_game_state(create_deck(rng), num_of_players, rng)
+        for _ in range(MAX_NUM_OF_STEPS):
+            if game_is_over(state):
+                break
+            player = state["curr_player"]
+            actions = list(legal_actions(state, player))
+            if not actions:
+                # The table is burned, without asking the bots
+                state, _ = play_action(state, None)
+                continue
+            next_states = []
+            for action in actions:
+                next_state, events = play_action(state, action)
+                played = [event for event in events if event[0] not in INFO_EVENTS]
+                assert played, (seed, action)
+                expected = expected_event(state, player, action)
+                if action[0] == Output_actions.TAKE:
+                    assert played[0][:2] == expected, (seed, action)
+                else:
+                    assert played[0] == expected, (seed, action)
+                next_states.append(next_state)
+            state = rng.choice(next_states)
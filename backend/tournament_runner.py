@@ -0,0 +1,281 @@
+# Parallel tournament runner.
+# Games are spread over a pool of worker processes (one per core by default).
+# Every worker loads each bot file once, in its initializer, and then plays
+# the games it is given with simulate_game, returning compact result records.
+# With sandboxed bots, the workers are threads of this process instead, each
+# with a sandboxed bot (a worker process of its own) for every seat, so the
+# bots never run in a process that talks to the server with pickle.
+
+import math
+import os
+import random
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from bot_clock import merge_timing
+from bot_loader import load_bot
+from bot_sandbox import acquire_sandboxed_bot, release_sandboxed_bot
+from simulation import simulate_game
+
+# The state of the current worker: its bots (in the order of the tournament's
+# bot list) and whether it times the bot calls
+_worker = threading.local()
+
+# The most games given to a worker at once, so that a cancel or a stopping
+# rule takes effect within a few games
+MAX_GAMES_PER_CHUNK = 4
+
+
+def _init_worker(
+    bot_paths: List[str],
+    timing: bool = False,
+    sandboxed_bots: Optional[List[Any]] = None,
+) -> None:
+    """Load the bots of a worker. With sandboxed_bots (a list shared by the
+    worker threads), the worker gets sandboxed bots, which are added to it so
+    they can be released after the tournament."""
+    _worker.timing = timing
+    if sandboxed_bots is not None:
+        _worker.bots = [acquire_sandboxed_bot(path) for path in bot_paths]
+        sandboxed_bots.extend(_worker.bots)
+        return
+    loaded: Dict[str, Any] = {}
+    for path in bot_paths:
+        if path not in loaded:
+            loaded[path] = load_bot(path)
+    _worker.bots = [loaded[path] for path in bot_paths]
+
+
+def _play_games(games: List[Tuple[int, List[int]]]) -> List[Dict[str, Any]]:
+    """Play games given as (seed, seating) pairs, where seating[i] is the index
+    (in the tournament's bot list) of the bot sitting at place i. The loser
+    and timing in each result are mapped back to the tournament's bot list."""
+    results = []
+    for seed, seating in games:
+        bots = [_worker.bots[i] for i in seating]
+        for bot in bots:
+            if getattr(bot, "sandboxed", False):
+                bot.new_game()
+        result = simulate_game(bots, seed, timing=_worker.timing)
+        if result["loser"] != -1:
+            result["loser"] = seating[result["loser"]]
+        timing = [None for _ in seating]
+        for place, bot_index in enumerate(seating):
+            timing[bot_index] = result["timing"][place]
+        result["timing"] = timing
+        result["seating"] = seating
+        results.append(result)
+    return results
+
+
+def _chunks(items: List[Any], num_of_chunks: int, unit: int = 1) -> List[List[Any]]:
+    """Split items into about num_of_chunks chunks, of a multiple of unit items."""
+    size = max(1, -(-len(items) // num_of_chunks))
+    size = -(-size // unit) * unit
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def add_to_deal(
+    deals: Dict[int, Dict[str, Any]], result: Dict[str, Any], num_of_bots: int
+) -> None:
+    """Count a game of a duplicate tournament in the record of its deal (all
+    the games of a deal share its seed)."""
+    deal = deals.setdefault(
+        result["seed"],
+        {
+            "seed": result["seed"],
+            "games": 0,
+            "loser_count_lst": [0 for _ in range(num_of_bots)],
+            "infinite_games": 0,
+        },
+    )
+    deal["games"] += 1
+    if result["loser"] != -1:
+        deal["loser_count_lst"][result["loser"]] += 1
+    else:
+        deal["infinite_games"] += 1
+
+
+def deal_loss_stats(
+    deals: List[Dict[str, Any]], num_of_bots: int
+) -> List[Dict[str, float]]:
+    """The loss rate of every bot over the deals of a duplicate tournament,
+    with its standard error. Each deal counts as one sample (the bot's share
+    of its games' losses), so the luck of the cards cancels out within it."""
+    stats = []
+    for bot_index in range(num_of_bots):
+        samples = [
+            deal["loser_count_lst"][bot_index] / deal["games"]
+            for deal in deals
+            if deal["games"]
+        ]
+        n = len(samples)
+        mean = sum(samples) / n if n else 0.0
+        variance = sum((x - mean) ** 2 for x in samples) / (n - 1) if n > 1 else 0.0
+        std_error = math.sqrt(variance / n) if n else 0.0
+        stats.append({"loss_rate": mean, "std_error": std_error})
+    return stats
+
+
+def play_tournament(
+    bot_paths: List[str],
+    num_of_games: int,
+    max_workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+    in_process: Optional[bool] = None,
+    duplicate: bool = False,
+    stop_rule: Optional[Any] = None,
+    timing: bool = False,
+    sandboxed: bool = False,
+) -> Dict[str, Any]:
+    """Play games with a random seating order each, until num_of_games games
+    ended with a loser (or 2 * num_of_games games were played).
+    With duplicate, the games are played in deals instead: every deal (a
+    seed) is played once for every rotation of a random seating, so each bot
+    gets the cards of every seat once. num_of_games is rounded up to whole
+    deals, games without a loser are not replaced, and the result also has
+    the record of every deal and the loss stats over the deals (see
+    deal_loss_stats), which need far fewer games for the same confidence.
+    A stop_rule (see early_stopping) is given every finished game, and the
+    tournament stops as soon as it is decided (with duplicate, only after
+    whole deals); num_of_games is then the most games to play, and the
+    result has the rule's summary.
+    Returns the loser count of every bot, the number of games without a loser,
+    the total time stats of every bot by action type (see BotClock; empty
+    unless timing is True, as timing every call slows the games down), the
+    result records of all games (each with the seed and seating to replay it)
+    and the seed of the tournament (random if not given). on_result is called
+    in this process for every finished game, and the tournament stops early
+    (with the games finished so far) once should_stop returns True.
+    Games are played in this process if in_process is True, or if it is None
+    and max_workers is 1. With sandboxed, the bots run in sandboxed workers
+    (see bot_sandbox), and the games in max_workers threads of this process
+    (or in this thread if in_process)."""
+    if seed is None:
+        seed = random.randrange(2**32)
+    rng = random.Random(seed)
+    num_of_bots = len(bot_paths)
+    max_workers = max_workers or os.cpu_count() or 1
+    if in_process is None:
+        in_process = max_workers == 1
+    loser_count_lst = [0 for _ in range(num_of_bots)]
+    total_timing = [{} for _ in range(num_of_bots)]
+    games: List[Dict[str, Any]] = []
+    deals: Dict[int, Dict[str, Any]] = {}
+    max_total_games = 2 * num_of_games
+    count_proper_games = 0
+
+    def next_batch(size: int) -> List[Tuple[int, List[int]]]:
+        batch = []
+        for _ in range(size):
+            seating = list(range(num_of_bots))
+            rng.shuffle(seating)
+            batch.append((rng.randrange(2**32), seating))
+        return batch
+
+    def next_deals(num_of_deals: int) -> List[Tuple[int, List[int]]]:
+        batch = []
+        for _ in range(num_of_deals):
+            seating = list(range(num_of_bots))
+            rng.shuffle(seating)
+            seed = rng.randrange(2**32)
+            for shift in range(num_of_bots):
+                batch.append((seed, seating[shift:] + seating[:shift]))
+        return batch
+
+    def collect(results: List[Dict[str, Any]]) -> None:
+        nonlocal count_proper_games
+        for result in results:
+            if count_proper_games >= num_of_games and not duplicate:
+                return
+            games.append(result)
+            if duplicate:
+                add_to_deal(deals, result, num_of_bots)
+            if stop_rule is not None:
+                stop_rule.add(result)
+            for bot_timing, game_timing in zip(total_timing, result["timing"]):
+                merge_timing(bot_timing, game_timing)
+            if result["loser"] != -1:
+                loser_count_lst[result["loser"]] += 1
+                count_proper_games += 1
+            if on_result is not None:
+                on_result(result)
+
+    def cancelled() -> bool:
+        return should_stop is not None and should_stop()
+
+    def stopped() -> bool:
+        if cancelled():
+            return True
+        if stop_rule is None or (duplicate and len(games) % num_of_bots):
+            return False
+        return stop_rule.decided()
+
+    def play(executor: Optional[Any], batch: List[Tuple[int, List[int]]]) -> bool:
+        """Play a batch of games; False if the tournament was stopped."""
+        if executor is None:
+            for game in batch:
+                if stopped():
+                    return False
+                results = _play_games([game])
+                if not cancelled():
+                    collect(results)
+            return True
+        # Several chunks per worker, to keep all workers busy until the end,
+        # of at most MAX_GAMES_PER_CHUNK games. A duplicate tournament is
+        # split into whole deals.
+        num_of_chunks = max(4 * max_workers, -(-len(batch) // MAX_GAMES_PER_CHUNK))
+        chunks = _chunks(batch, num_of_chunks, num_of_bots if duplicate else 1)
+        for results in executor.map(_play_games, chunks):
+            # Games that finish after a cancel are dropped
+            if not cancelled():
+                collect(results)
+            if stopped():
+                executor.shutdown(wait=False, cancel_futures=True)
+                return False
+        return True
+
+    def run(executor: Optional[Any]) -> None:
+        if duplicate:
+            play(executor, next_deals(-(-num_of_games // num_of_bots)))
+            return
+        # Games that end without a loser are replaced by new ones
+        while count_proper_games < num_of_games and len(games) < max_total_games:
+            batch_size = min(
+                num_of_games - count_proper_games, max_total_games - len(games)
+            )
+            if not play(executor, next_batch(batch_size)):
+                return
+
+    sandboxed_bots: Optional[List[Any]] = [] if sandboxed else None
+    try:
+        if in_process:
+            _init_worker(bot_paths, timing, sandboxed_bots)
+            run(None)
+        else:
+            executor_class = ThreadPoolExecutor if sandboxed else ProcessPoolExecutor
+            with executor_class(
+                max_workers,
+                initializer=_init_worker,
+                initargs=(bot_paths, timing, sandboxed_bots),
+            ) as executor:
+                run(executor)
+    finally:
+        for bot in sandboxed_bots or []:
+            release_sandboxed_bot(bot)
+    results = {
+        "loser_count_lst": loser_count_lst,
+        "num_of_infinite_games": len(games) - count_proper_games,
+        "timing": total_timing,
+        "games": games,
+        "seed": seed,
+    }
+    if duplicate:
+        results["deals"] = list(deals.values())
+        results["deal_stats"] = deal_loss_stats(results["deals"], num_of_bots)
+    if stop_rule is not None:
+        results["stop_rule"] = stop_rule.summary()
+    return results
@@ -1,13 +1,17 @@
-import React, { useState } from "react";
+import React, { useState, useRef } from "react";
 
 const API_URL = "http://127.0.0.1:8000/api";
 
 function TournamentUI({ bots, onBack }) {
     const [selectedBots, setSelectedBots] = useState([]);
     const [numGames, setNumGames] = useState(10);
+    const [duplicate, setDuplicate] = useState(false);
+    const [earlyStop, setEarlyStop] = useState("");
+    const [timing, setTiming] = useState(false);
     const [results, setResults] = useState(null);
     const [running, setRunning] = useState(false);
     const [error, setError] = useState("");
+    const jobIdRef = useRef(null);
 
     const handleBotToggle = idx => {
         setSelectedBots(selectedBots.includes(idx)
@@ -32,7 +36,10 @@ function TournamentUI({ bots, onBack }) {
                 headers: { "Content-Type": "application/json" },
                 body: JSON.stringify({
                     bots: selectedBots.map(i => bots[i]?.filename),
-                    numGames
+                    numGames,
+                    duplicate,
+                    earlyStop: earlyStop || null,
+                    timing
                 })
             });
             console.log("[TournamentUI] Response status:", res.status);
@@ -53,15 +60,36 @@ function TournamentUI({ bots, onBack }) {
                 console.log("[TournamentUI] Error parsing result JSON", e);
                 throw new Error("Could not parse tournament results");
             }
-            console.log("[TournamentUI] Tournament results:", data);
+            // The tournament runs in the background: poll it for progress
+            jobIdRef.current = data.job_id;
             setResults(data);
+            while (data.status === "queued" || data.status === "running") {
+                await new Promise(resolve => setTimeout(resolve, 500));
+                const pollRes = await fetch(`${API_URL}/tournament/${data.job_id}`);
+                if (!pollRes.ok) {
+                    throw new Error("Lost track of the tournament");
+                }
+                data = await pollRes.json();
+                setResults(data);
+            }
+            console.log("[TournamentUI] Tournament results:", data);
+            if (data.status === "failed") {
+                throw new Error(data.error || "Tournament failed");
+            }
         } catch (e) {
             setError(e.message);
             console.log("[TournamentUI] Exception:", e);
         }
+        jobIdRef.current = null;
         setRunning(false);
     };
 
+    const cancelTournament = async () => {
+        if (!jobIdRef.current) return;
+        console.log("[TournamentUI] Cancelling tournament", jobIdRef.current);
+        await fetch(`${API_URL}/tournament/${jobIdRef.current}`, { method: "DELETE" });
+    };
+
     return (
         <div style={{ margin: 24, padding: 24, background: "#f8fafc", borderRadius: 12, boxShadow: "0 2px 8px #e0e7ff" }}>
             <button onClick={onBack} style={{ marginBottom: 18, padding: "8px 20px", fontSize: 16, borderRadius: 8 }}>
@@ -93,6 +121,34 @@ function TournamentUI({ bots, onBack }) {
                     onChange={e => setNumGames(Number(e.target.value))}
                     style={{ width: 60, fontSize: 16, marginLeft: 8 }}
                 />
+                <label style={{ marginLeft: 16 }}>
+                    <input
+                        type="checkbox"
+                        checked={duplicate}
+                        onChange={e => setDuplicate(e.target.checked)}
+                    />
+                    Duplicate deals (every bot plays every seat of each deal)
+                </label>
+                <label style={{ marginLeft: 16 }}>
+                    Stop early:
+                    <select
+                        value={earlyStop}
+                        onChange={e => setEarlyStop(e.target.value)}
+                        style={{ marginLeft: 8 }}
+                    >
+                        <option value="">No (play all games)</option>
+                        <option value="sprt">Once the weaker bot of every pair is known (SPRT)</option>
+                        <option value="ci">Once every loss rate is known within ±5%</option>
+                    </select>
+                </label>
+                <label style={{ marginLeft: 16 }}>
+                    <input
+                        type="checkbox"
+                        checked={timing}
+                        onChange={e => setTiming(e.target.checked)}
+                    />
+                    Time bot calls (slower)
+                </label>
             </div>
             <button
                 onClick={runTournament}
@@ -101,17 +157,57 @@ function TournamentUI({ bots, onBack }) {
             >
                 {running ? "Running..." : "Start Tournament"}
             </button>
+            {running && (
+                <button
+                    onClick={cancelTournament}
+                    style={{ marginLeft: 12, padding: "8px 24px", fontSize: 18, borderRadius: 8 }}
+                >
+                    Cancel
+                </button>
+            )}
             {error && <div style={{ color: "red", marginTop: 12 }}>{error}</div>}
             {results && (
                 <div style={{ marginTop: 24 }}>
                     <h3>Results</h3>
                     <ul>
                         {results.loser_count_lst && results.loser_count_lst.map((count, i) => (
-                            <li key={i}>{bots[selectedBots[i]] ? bots[selectedBots[i]].name : `Bot ${i}`}:    {count} losses</li>
+                            <li key={i}>
+                                {bots[selectedBots[i]] ? bots[selectedBots[i]].name : `Bot ${i}`}:    {count} losses
+                                {results.deal_stats && results.deal_stats[i] && (
+                                    <span style={{ marginLeft: 12 }}>
+                                        (loss rate {(100 * results.deal_stats[i].loss_rate).toFixed(1)}% ± {(100 * results.deal_stats[i].std_error).toFixed(1)}%)
+                                    </span>
+                                )}
+                                {results.timing && results.timing[i] && results.timing[i].calls > 0 && (
+                                    <span style={{ color: "#64748b", marginLeft: 12 }}>
+                                        ({(1000 * results.timing[i].cpu / results.timing[i].calls).toFixed(3)} ms CPU per call, slowest call {(1000 * results.timing[i].max_wall).toFixed(1)} ms)
+                                    </span>
+                                )}
+                            </li>
                         ))}
                     </ul>
-                    <div>Total games: {results.total_games}</div>
+                    <div>Total games: {results.total_games}{results.status === "queued" ? " (waiting for other tournaments)" : ""}{results.status === "running" ? ` (running, ${results.games_completed} of ${results.num_games})` : ""}{results.status === "cancelled" ? " (cancelled)" : ""}</div>
                     <div>Games with no loser (max steps reached): {results.infinite_games}</div>
+                    {results.stop_rule && (
+                        <div style={{ marginTop: 12 }}>
+                            <b>Early stopping ({results.stop_rule.rule}):</b>{" "}
+                            {results.stop_rule.separated ? "decided" : "not decided"} after {results.stop_rule.games} games
+                            <ul>
+                                {results.stop_rule.pairs && results.stop_rule.pairs.map(pair => (
+                                    <li key={pair.bots.join("-")}>
+                                        {pair.bots.map(i => bots[selectedBots[i]] ? bots[selectedBots[i]].name : `Bot ${i}`).join(" vs ")}:{" "}
+                                        {!pair.decided ? "undecided" : pair.weaker === -1 ? "even" : `${bots[selectedBots[pair.weaker]] ? bots[selectedBots[pair.weaker]].name : `Bot ${pair.weaker}`} is weaker`}
+                                        {" "}(confidence {(100 * pair.confidence).toFixed(1)}%)
+                                    </li>
+                                ))}
+                                {results.stop_rule.half_widths && results.stop_rule.half_widths.map((halfWidth, i) => (
+                                    <li key={i}>
+                                        {bots[selectedBots[i]] ? bots[selectedBots[i]].name : `Bot ${i}`}: loss rate {(100 * results.stop_rule.loss_rates[i]).toFixed(1)}% ± {(100 * halfWidth).toFixed(1)}%
+                                    </li>
+                                ))}
+                            </ul>
+                        </div>
+                    )}
                 </div>
             )}
         </div>
@@ -342,6 +342,40 @@ function BotManagerPage({ onStartGame, bots, setBots, selectedBots, setSelectedB
     );
 }
 
+// Apply a step delta from /games/{id}/stream to a game state
+function applyStepDelta(gameState, delta) {
+    const state = { ...gameState.state };
+    // Later steps ask only for what changed since this version
+    if ("version" in delta) state.version = delta.version;
+    state.hands = state.hands.map((hand, idx) => {
+        const removed = delta.hands_removed?.[idx] || [];
+        const added = delta.hands_added?.[idx] || [];
+        if (!removed.length && !added.length) return hand;
+        return [...hand.filter(card => !removed.includes(card)), ...added];
+    });
+    if (delta.log) {
+        state.log = (state.log || []).map((botLog, idx) =>
+            delta.log[idx] ? [...botLog, ...delta.log[idx]] : botLog
+        );
+    }
+    for (const key of [
+        "table_attack", "table_defence", "attacker", "defender",
+        "curr_player", "deck_count", "num_of_burned_cards", "status",
+    ]) {
+        if (key in delta) state[key] = delta[key];
+    }
+    return { ...gameState, state };
+}
+
+// Merge a response of /games/{id}/step?since=... into a game state
+function mergeStateUpdate(gameState, update) {
+    const { log: newLog, ...changed } = update.state;
+    const log = (gameState.state.log || []).map((botLog, idx) =>
+        newLog?.[idx]?.length ? [...botLog, ...newLog[idx]] : botLog
+    );
+    return { ...gameState, state: { ...gameState.state, ...changed, log } };
+}
+
 function GamePage({ onBack, selectedBots }) {
     const [gameState, setGameState] = useState(null);
     const [playMode, setPlayMode] = useState("step"); // "step" or "auto"
@@ -369,36 +403,41 @@ function GamePage({ onBack, selectedBots }) {
             });
     }, [selectedBots, gameStarted]);
 
-    // When switching to auto, finish the game from current state
+    // When switching to auto, finish the game from current state.
+    // The server plays the game and streams only what changed in each step.
     useEffect(() => {
         if (!gameState?.id || playMode !== "auto" || !gameStarted) return;
-        let cancelled = false;
-        async function autoStep() {
-            let state = gameState;
-            while (
-                state &&
-                state.state &&
-                state.state.hands.filter(h => h.length > 0).length > 1
-            ) {
-                const resp = await fetch(`${API_URL}/games/${state.id}/step`, { method: "POST" });
-                const data = await resp.json();
-                if (cancelled) return;
-                setGameState(data);
-                state = data;
-                console.log("[GamePage] Auto step, new state:", data);
-                await new Promise(res => setTimeout(res, autoSpeed));
-            }
-        }
-        autoStep();
-        return () => { cancelled = true; };
+        const source = new EventSource(
+            `${API_URL}/games/${gameState.id}/stream?delay=${autoSpeed / 1000}`
+        );
+        source.onmessage = event => {
+            const delta = JSON.parse(event.data);
+            setGameState(prev => applyStepDelta(prev, delta));
+        };
+        source.addEventListener("end", () => {
+            console.log("[GamePage] Auto play finished");
+            source.close();
+        });
+        source.onerror = err => {
+            console.log("[GamePage] Auto play stream error", err);
+            source.close();
+        };
+        return () => source.close();
     }, [playMode, gameState?.id, gameStarted, autoSpeed]);
 
-    const handleNextStep = async () => {
+    // mode is "" for a single step, or "round_end" / "game_end" to let the
+    // server play until then in a single request
+    const handleNextStep = async (mode = "") => {
         if (!gameState?.id) return;
-        const resp = await fetch(`${API_URL}/games/${gameState.id}/step`, { method: "POST" });
+        // Only ask for what changed since the version we already have
+        const until = mode ? `&until=${mode}` : "";
+        const resp = await fetch(
+            `${API_URL}/games/${gameState.id}/step?since=${gameState.state.version}&exclude=bot_states,deck${until}`,
+            { method: "POST" }
+        );
         const data = await resp.json();
-        setGameState(data);
-        console.log("[GamePage] Step button pressed, new state:", data);
+        setGameState(prev => mergeStateUpdate(prev, data));
+        console.log("[GamePage] Step button pressed, changes:", data);
     };
 
     // Helper: get winner and loser indices
@@ -624,12 +663,26 @@ function GamePage({ onBack, selectedBots }) {
                 <>
                     <div style={{ marginBottom: 12 }}>
                         {playMode === "step" && (
-                            <button
-                                style={{ padding: "6px 18px", fontSize: 15, borderRadius: 6, marginRight: 10 }}
-                                onClick={handleNextStep}
-                            >
-                                Next Step
-                            </button>
+                            <>
+                                <button
+                                    style={{ padding: "6px 18px", fontSize: 15, borderRadius: 6, marginRight: 10 }}
+                                    onClick={() => handleNextStep()}
+                                >
+                                    Next Step
+                                </button>
+                                <button
+                                    style={{ padding: "6px 18px", fontSize: 15, borderRadius: 6, marginRight: 10 }}
+                                    onClick={() => handleNextStep("round_end")}
+                                >
+                                    End of Round
+                                </button>
+                                <button
+                                    style={{ padding: "6px 18px", fontSize: 15, borderRadius: 6, marginRight: 10 }}
+                                    onClick={() => handleNextStep("game_end")}
+                                >
+                                    Skip to End
+                                </button>
+                            </>
                         )}
                         <button
                             style={{ padding: "5px 14px", fontSize: 13, borderRadius: 6 }}